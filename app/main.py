@@ -1,44 +1,63 @@
+import hmac
+import itertools
 import logging
 import os
 import sys
 import time
 from contextlib import asynccontextmanager
+from typing import Dict
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.responses import ORJSONResponse, static_json, static_response
 from app.routers import fit, nutri, tips
+from app.services.cache import cache_stats
+from app.services.ia_client import close_async_client, open_async_client
 
 # Load environment variables only once at startup
 if not os.getenv("OPENAI_API_KEY"):
     load_dotenv()
 
+# Environment is fixed for the lifetime of the process - read it once
+IS_PRODUCTION = bool(os.getenv("PRODUCTION"))
+MASTER_API_KEY = os.getenv("MASTER_API_KEY")
+OPENAI_API_KEY_PRESENT = bool(os.getenv("OPENAI_API_KEY"))
+
 # Logging configuration with file handling based on environment
 log_handlers = [logging.StreamHandler(sys.stdout)]
 
 # Add file handler only if explicitly enabled
-if os.getenv("LOG_TO_FILE", "false").lower() == "true" and not os.getenv("PRODUCTION"):
+if os.getenv("LOG_TO_FILE", "false").lower() == "true" and not IS_PRODUCTION:
     try:
         log_handlers.append(logging.FileHandler("api.log"))
     except Exception as e:
         print(f"Warning: Could not create log file: {e}")
 
 logging.basicConfig(
-    level=logging.DEBUG if not os.getenv("PRODUCTION") else logging.INFO,
+    level=logging.DEBUG if not IS_PRODUCTION else logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=log_handlers,
 )
 
 logger = logging.getLogger(__name__)
 
+# Recently validated API keys -> monotonic timestamp of validation
+_validation_cache: Dict[str, float] = {}
+_CACHE_TTL = 300
+_CACHE_MAX_SIZE = 1024
+
 
 # API Key authentication
 async def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     """Verify API key for request authentication"""
-    master_key = os.getenv("MASTER_API_KEY")
+    # Fast path for keys validated within the TTL window
+    validated_at = _validation_cache.get(x_api_key)
+    if validated_at is not None and time.monotonic() - validated_at < _CACHE_TTL:
+        return True
 
     # Check if API key header is missing
     if x_api_key is None:
@@ -50,9 +69,9 @@ async def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
             },
         )
 
-    if not master_key:
+    if not MASTER_API_KEY:
         # Development mode - log warning but allow access
-        if not os.getenv("PRODUCTION"):
+        if not IS_PRODUCTION:
             logger.warning("⚠️ No MASTER_API_KEY set - API running in development mode")
             return True
         else:
@@ -60,8 +79,11 @@ async def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
                 status_code=500, detail="API authentication not configured"
             )
 
-    if x_api_key != master_key:
-        logger.warning(f"🔐 Invalid API key attempt from {x_api_key[:8]}...")
+    # Compare as bytes: compare_digest rejects non-ASCII str operands
+    if not isinstance(x_api_key, str) or not hmac.compare_digest(
+        x_api_key.encode(), MASTER_API_KEY.encode()
+    ):
+        logger.warning("🔐 Invalid API key attempt from %s...", x_api_key[:8])
         raise HTTPException(
             status_code=401,
             detail={
@@ -70,9 +92,17 @@ async def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
             },
         )
 
+    # Bound memory by evicting the oldest entry (dicts keep insertion order)
+    if len(_validation_cache) >= _CACHE_MAX_SIZE:
+        _validation_cache.pop(next(iter(_validation_cache)))
+    _validation_cache[x_api_key] = time.monotonic()
+
     return True
 
 
+_REQUIRED_ENV_VARS = frozenset({"OPENAI_API_KEY"})
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -80,31 +110,35 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Universe API starting up...")
 
     # Verify critical environment variables
-    required_env_vars = ["OPENAI_API_KEY"]
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+    missing_vars = sorted(v for v in _REQUIRED_ENV_VARS if not os.environ.get(v))
 
     if missing_vars:
-        logger.error(f"Missing required environment variables: {missing_vars}")
+        logger.error("Missing required environment variables: %s", missing_vars)
         raise RuntimeError(f"Missing environment variables: {missing_vars}")
 
     # Security check
-    if os.getenv("PRODUCTION") and not os.getenv("MASTER_API_KEY"):
+    if IS_PRODUCTION and not MASTER_API_KEY:
         logger.error("🔒 MASTER_API_KEY required in production mode")
         raise RuntimeError("MASTER_API_KEY required in production")
 
     logger.info("✅ Environment variables validated")
+
+    # Build the pooled OpenAI client now rather than on the first request
+    open_async_client()
     logger.info("✅ Universe API started successfully")
 
     yield
 
     # Shutdown
     logger.info("🛑 Universe API shutting down...")
+    await close_async_client()
 
 
-# Create FastAPI app with lifespan
-app = FastAPI(
-    title="Universe API",
-    description="""
+if IS_PRODUCTION:
+    # Docs are not served in production - skip building the OpenAPI schema
+    _docs_options = {"docs_url": None, "redoc_url": None, "openapi_url": None}
+else:
+    _docs_options = {"description": """
     🌟 **Universe API** - Your Ultimate Health & Wellness Platform
     
     Advanced AI-powered API providing personalized fitness, nutrition, and wellness guidance.
@@ -143,7 +177,11 @@ app = FastAPI(
     4. Receive personalized, actionable recommendations
     
     Perfect for fitness apps, health platforms, or personal wellness tools.
-    """,
+    """}
+
+# Create FastAPI app with lifespan
+app = FastAPI(
+    title="Universe API",
     version="2.0.0",
     contact={
         "name": "Universe API Support",
@@ -154,11 +192,13 @@ app = FastAPI(
         "url": "https://opensource.org/licenses/MIT",
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    **_docs_options,
 )
 
 # CORS configuration - more restrictive for production
 allowed_origins = ["*"]  # Default for development
-if os.getenv("PRODUCTION"):
+if IS_PRODUCTION:
     # In production, only allow specific domains
     allowed_origins = [
         "https://rapidapi.com",
@@ -178,63 +218,115 @@ app.add_middleware(
 )
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests with timing"""
-    start_time = time.time()
-
-    # Log request (avoid logging sensitive data in production)
-    if not os.getenv("PRODUCTION"):
-        logger.info(
-            f"📨 {request.method} {request.url.path} - Client: {request.client.host}"
-        )
-    else:
-        logger.info(f"📨 {request.method} {request.url.path}")
-
-    response = await call_next(request)
-
-    # Log response time
-    process_time = time.time() - start_time
-    logger.info(
-        f"⏱️ Request processed in {process_time:.3f}s - Status: {response.status_code}"
-    )
-
-    return response
+# Error identifiers, unique per worker process
+_ERROR_ID_PREFIX = f"err-{os.getpid():x}"
+_error_ids = itertools.count()
 
 
 # Global exception handler
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors gracefully"""
     logger.error(
-        f"❌ Unexpected error on {request.method} {request.url.path}: {str(exc)}"
+        "❌ Unexpected error on %s %s: %s", request.method, request.url.path, exc
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "message": "An unexpected error occurred. Please try again later.",
-            "request_id": f"{int(time.time())}-{hash(str(request.url))}",
+            "request_id": f"{_ERROR_ID_PREFIX}-{next(_error_ids):x}",
         },
     )
 
 
+class RequestMiddleware:
+    """Pure ASGI middleware turning unexpected errors into 500 responses"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = await global_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+
+
+class RequestLoggingMiddleware(RequestMiddleware):
+    """RequestMiddleware that also logs every request with timing"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        logger.info(
+            "📨 %s %s - Client: %s",
+            scope["method"],
+            scope["path"],
+            scope["client"][0] if scope.get("client") else None,
+        )
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await super().__call__(scope, receive, send_wrapper)
+
+        # Log response time
+        logger.info(
+            "⏱️ Request processed in %.3fs - Status: %s",
+            time.perf_counter() - start_time,
+            status_code,
+        )
+
+
+# Production relies on uvicorn's access log instead of per-request logging
+app.add_middleware(RequestMiddleware if IS_PRODUCTION else RequestLoggingMiddleware)
+
+
 # Create public metadata routers
 fitness_metadata_router = APIRouter(
-    prefix="/api/v1/metadata/fitness", tags=["Fitness Metadata"]
+    prefix="/api/v1/metadata/fitness",
+    tags=["Fitness Metadata"],
+    default_response_class=ORJSONResponse,
 )
 nutrition_metadata_router = APIRouter(
-    prefix="/api/v1/metadata/nutrition", tags=["Nutrition Metadata"]
+    prefix="/api/v1/metadata/nutrition",
+    tags=["Nutrition Metadata"],
+    default_response_class=ORJSONResponse,
+)
+tips_metadata_router = APIRouter(
+    prefix="/api/v1/metadata/tips",
+    tags=["Tips Metadata"],
+    default_response_class=ORJSONResponse,
 )
-tips_metadata_router = APIRouter(prefix="/api/v1/metadata/tips", tags=["Tips Metadata"])
 
 
 # Fitness metadata routes
-@fitness_metadata_router.get("/fitness-levels")
-async def public_get_fitness_levels():
-    return {
+_FITNESS_LEVELS = static_json(
+    {
         "fitness_levels": [
             {
                 "id": "beginner",
@@ -258,11 +350,16 @@ async def public_get_fitness_levels():
             },
         ]
     }
+)
 
 
-@fitness_metadata_router.get("/equipment")
-async def public_get_equipment_options():
-    return {
+@fitness_metadata_router.get("/fitness-levels")
+async def public_get_fitness_levels(request: Request):
+    return static_response(request, _FITNESS_LEVELS)
+
+
+_EQUIPMENT_OPTIONS = static_json(
+    {
         "equipment_options": [
             {
                 "id": "bodyweight",
@@ -282,11 +379,16 @@ async def public_get_equipment_options():
             {"id": "gym", "name": "Commercial Gym", "description": "Full gym access"},
         ]
     }
+)
 
 
-@fitness_metadata_router.get("/goals")
-async def public_get_fitness_goals():
-    return {
+@fitness_metadata_router.get("/equipment")
+async def public_get_equipment_options(request: Request):
+    return static_response(request, _EQUIPMENT_OPTIONS)
+
+
+_FITNESS_GOALS = static_json(
+    {
         "goals": [
             {
                 "id": "weight_loss",
@@ -320,12 +422,17 @@ async def public_get_fitness_goals():
             },
         ]
     }
+)
+
+
+@fitness_metadata_router.get("/goals")
+async def public_get_fitness_goals(request: Request):
+    return static_response(request, _FITNESS_GOALS)
 
 
 # Nutrition metadata routes
-@nutrition_metadata_router.get("/dietary-preferences")
-async def public_get_dietary_preferences():
-    return {
+_DIETARY_PREFERENCES = static_json(
+    {
         "dietary_preferences": [
             {
                 "id": "no_restrictions",
@@ -380,11 +487,16 @@ async def public_get_dietary_preferences():
             },
         ]
     }
+)
 
 
-@nutrition_metadata_router.get("/activity-levels")
-async def public_get_activity_levels():
-    return {
+@nutrition_metadata_router.get("/dietary-preferences")
+async def public_get_dietary_preferences(request: Request):
+    return static_response(request, _DIETARY_PREFERENCES)
+
+
+_ACTIVITY_LEVELS = static_json(
+    {
         "activity_levels": [
             {
                 "id": "sedentary",
@@ -413,11 +525,16 @@ async def public_get_activity_levels():
             },
         ]
     }
+)
 
 
-@nutrition_metadata_router.get("/goals")
-async def public_get_nutrition_goals():
-    return {
+@nutrition_metadata_router.get("/activity-levels")
+async def public_get_activity_levels(request: Request):
+    return static_response(request, _ACTIVITY_LEVELS)
+
+
+_NUTRITION_GOALS = static_json(
+    {
         "goals": [
             {
                 "id": "weight_loss",
@@ -451,12 +568,17 @@ async def public_get_nutrition_goals():
             },
         ]
     }
+)
+
+
+@nutrition_metadata_router.get("/goals")
+async def public_get_nutrition_goals(request: Request):
+    return static_response(request, _NUTRITION_GOALS)
 
 
 # Tips metadata routes
-@tips_metadata_router.get("/fitness-levels")
-async def public_get_experience_levels():
-    return {
+_EXPERIENCE_LEVELS = static_json(
+    {
         "fitness_levels": [
             {
                 "id": "beginner",
@@ -480,11 +602,16 @@ async def public_get_experience_levels():
             },
         ]
     }
+)
 
 
-@tips_metadata_router.get("/challenges")
-async def public_get_challenges():
-    return {
+@tips_metadata_router.get("/fitness-levels")
+async def public_get_experience_levels(request: Request):
+    return static_response(request, _EXPERIENCE_LEVELS)
+
+
+_CHALLENGES = static_json(
+    {
         "challenges": [
             {
                 "id": "lack_of_motivation",
@@ -524,11 +651,16 @@ async def public_get_challenges():
             },
         ]
     }
+)
 
 
-@tips_metadata_router.get("/activities")
-async def public_get_preferred_activities():
-    return {
+@tips_metadata_router.get("/challenges")
+async def public_get_challenges(request: Request):
+    return static_response(request, _CHALLENGES)
+
+
+_PREFERRED_ACTIVITIES = static_json(
+    {
         "activities": [
             {
                 "id": "weight_training",
@@ -582,11 +714,16 @@ async def public_get_preferred_activities():
             },
         ]
     }
+)
 
 
-@tips_metadata_router.get("/health-conditions")
-async def public_get_health_conditions():
-    return {
+@tips_metadata_router.get("/activities")
+async def public_get_preferred_activities(request: Request):
+    return static_response(request, _PREFERRED_ACTIVITIES)
+
+
+_HEALTH_CONDITIONS = static_json(
+    {
         "health_conditions": [
             {
                 "id": "diabetes",
@@ -640,45 +777,46 @@ async def public_get_health_conditions():
             },
         ]
     }
+)
 
 
-# Include public metadata routers FIRST (these will be processed before authenticated routes)
-app.include_router(fitness_metadata_router)
-app.include_router(nutrition_metadata_router)
-app.include_router(tips_metadata_router)
+@tips_metadata_router.get("/health-conditions")
+async def public_get_health_conditions(request: Request):
+    return static_response(request, _HEALTH_CONDITIONS)
 
-# Include routers with API key dependency (these come after public routes)
-app.include_router(
-    fit.router,
-    prefix="/api/v1/fitness",
-    tags=["Fitness & Workouts"],
-    dependencies=[Depends(verify_api_key)],
-)
 
-app.include_router(
-    nutri.router,
-    prefix="/api/v1/nutrition",
-    tags=["Nutrition & Diet"],
-    dependencies=[Depends(verify_api_key)],
-)
+# Single API key dependency shared by every authenticated router
+_AUTH_DEP = Depends(verify_api_key)
 
-app.include_router(
-    tips.router,
-    prefix="/api/v1/tips",
-    tags=["Health Tips & Advice"],
-    dependencies=[Depends(verify_api_key)],
-)
+# (router, prefix, tags, dependencies) - public metadata routers come FIRST so
+# they are processed before authenticated routes
+_ROUTES = [
+    (fitness_metadata_router, None, None, None),
+    (nutrition_metadata_router, None, None, None),
+    (tips_metadata_router, None, None, None),
+    (fit.router, "/api/v1/fitness", ["Fitness & Workouts"], [_AUTH_DEP]),
+    (nutri.router, "/api/v1/nutrition", ["Nutrition & Diet"], [_AUTH_DEP]),
+    (tips.router, "/api/v1/tips", ["Health Tips & Advice"], [_AUTH_DEP]),
+]
 
+for router, prefix, tags, dependencies in _ROUTES:
+    options = {"prefix": prefix, "tags": tags, "dependencies": dependencies}
+    app.include_router(router, **{k: v for k, v in options.items() if v})
 
-# Root endpoint (no auth required)
-@app.get("/", tags=["System"])
-async def root():
-    """
-    🏠 Welcome to Universe API
 
-    Your gateway to personalized health and wellness recommendations.
-    """
-    return {
+# Docs links only where the docs are served - production disables them all
+_DOCS_LINKS = (
+    {"interactive": app.docs_url, "openapi": app.openapi_url} if app.openapi_url else {}
+)
+_SUPPORT_DOCS_LINKS = (
+    {"documentation": app.docs_url, "openapi_spec": app.openapi_url}
+    if app.openapi_url
+    else {}
+)
+
+# Root endpoint (no auth required)
+_ROOT = static_json(
+    {
         "message": "Welcome to Universe API",
         "status": "operational",
         "version": "2.0.0",
@@ -694,11 +832,32 @@ async def root():
             "nutrition": "/api/v1/nutrition",
             "tips": "/api/v1/tips",
         },
-        "documentation": {"interactive": "/docs", "openapi": "/openapi.json"},
+        **({"documentation": _DOCS_LINKS} if _DOCS_LINKS else {}),
     }
+)
+
+
+@app.get("/", tags=["System"])
+async def root(request: Request):
+    """
+    🏠 Welcome to Universe API
+
+    Your gateway to personalized health and wellness recommendations.
+    """
+    return static_response(request, _ROOT)
 
 
 # Health check endpoint (no auth required)
+# Basic health checks - these only depend on the environment read at import
+_HEALTH_CHECKS = {
+    "api": "ok",
+    "environment": "ok" if OPENAI_API_KEY_PRESENT else "missing_config",
+    "authentication": (
+        "ok" if MASTER_API_KEY or not IS_PRODUCTION else "missing_config"
+    ),
+}
+
+
 @app.get("/health", tags=["System"])
 async def health_check():
     """
@@ -706,43 +865,20 @@ async def health_check():
 
     Returns the current health status of the API and its dependencies.
     """
-    try:
-        # Basic health checks
-        health_status = {
+    # Additional checks could be added here (database, external APIs, etc.)
+    return ORJSONResponse(
+        {
             "status": "healthy",
             "timestamp": int(time.time()),
             "version": "2.0.0",
-            "checks": {
-                "api": "ok",
-                "environment": (
-                    "ok" if os.getenv("OPENAI_API_KEY") else "missing_config"
-                ),
-                "authentication": (
-                    "ok"
-                    if os.getenv("MASTER_API_KEY") or not os.getenv("PRODUCTION")
-                    else "missing_config"
-                ),
-            },
+            "checks": _HEALTH_CHECKS,
         }
-
-        # Additional checks could be added here (database, external APIs, etc.)
-
-        return health_status
-
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    )
 
 
 # API information endpoint
-@app.get("/api/v1/info", tags=["System"])
-async def api_info():
-    """
-    ℹ️ API Information
-
-    Provides detailed information about API capabilities and usage.
-    """
-    return {
+_API_INFO = static_json(
+    {
         "api_name": "Universe API",
         "version": "2.0.0",
         "description": "Comprehensive health and wellness AI platform",
@@ -778,17 +914,54 @@ async def api_info():
         "supported_formats": ["JSON"],
         "authentication": "API Key (if configured)",
         "rate_limits": "Dynamic based on usage",
-        "support": {
-            "documentation": "/docs",
-            "openapi_spec": "/openapi.json",
-            "contact": "support@universe-api.com",
-        },
+        "support": {**_SUPPORT_DOCS_LINKS, "contact": "support@universe-api.com"},
     }
+)
+
+
+@app.get("/api/v1/info", tags=["System"])
+async def api_info(request: Request):
+    """
+    ℹ️ API Information
+
+    Provides detailed information about API capabilities and usage.
+    """
+    return static_response(request, _API_INFO)
+
+
+@app.get("/metrics", tags=["System"], dependencies=[_AUTH_DEP])
+async def metrics():
+    """
+    📊 Response cache metrics
+
+    Reports size and hit rate of the in-process response caches of this worker.
+    """
+    return {"caches": cache_stats()}
 
 
 # Run the application
 if __name__ == "__main__":
     logger.info("🚀 Starting Universe API server...")
-    uvicorn.run(
-        "app.main:app", host="0.0.0.0", port=8000, reload=True, log_level="info"
-    )
+    if IS_PRODUCTION:
+        # One process per core is wasted capacity - scale out with workers
+        workers = int(os.getenv("UVICORN_WORKERS", (os.cpu_count() or 1) * 2 + 1))
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=workers,
+            log_level="info",
+        )
+    else:
+        # Auto-reload is incompatible with multiple workers
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            reload=True,
+            log_level="info",
+        )
@@ -0,0 +1,28 @@
+import hashlib
+from typing import Any, Dict, Tuple
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which emits bytes directly"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def static_json(payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize a static payload once and derive its HTTP caching headers"""
+    body = orjson.dumps(payload)
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    return body, {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+
+
+def static_response(request: Request, static: Tuple[bytes, Dict[str, str]]) -> Response:
+    """Serve a payload precomputed by static_json, honouring If-None-Match"""
+    body, headers = static
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,58 +1,61 @@
 import logging
 import os
-from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Body, HTTPException
-from pydantic import BaseModel, Field, validator
+import orjson
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from starlette.background import BackgroundTask
 
-from app.services.ia_client import ask_llm
+from app.responses import ORJSONResponse, static_json, static_response
+from app.services.cache import TTLCache, make_key, single_flight
+from app.services.ia_client import LLMStream, ask_llm, ask_llm_stream
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Environment is fixed for the lifetime of the process - read it once
+IS_PRODUCTION = bool(os.getenv("PRODUCTION"))
 
-class GenderEnum(str, Enum):
-    MALE = "M"
-    FEMALE = "F"
+# Bump whenever the prompt changes so cached workouts are regenerated
+PROMPT_VERSION = "2"
 
+# Identical workout requests are served from memory for a day
+_workout_cache = TTLCache("workout", maxsize=10_000, ttl=86400)
+# Near-identical ones (see _similarity_key) reuse the same plan
+_similar_workout_cache = TTLCache("workout_similar", maxsize=50_000, ttl=86400)
 
-class FitnessLevelEnum(str, Enum):
-    BEGINNER = "beginner"
-    INTERMEDIATE = "intermediate"
-    ADVANCED = "advanced"
-    EXPERT = "expert"
 
-
-class FitnessGoalEnum(str, Enum):
-    MUSCLE_GAIN = "muscle_gain"
-    WEIGHT_LOSS = "weight_loss"
-    STRENGTH = "strength"
-    ENDURANCE = "endurance"
-    ATHLETIC_PERFORMANCE = "athletic_performance"
-    GENERAL_FITNESS = "general_fitness"
-    REHABILITATION = "rehabilitation"
-
-
-class EquipmentEnum(str, Enum):
-    NONE = "bodyweight"
-    HOME_BASIC = "home_basic"
-    FULL_GYM = "full_gym"
-    MINIMAL = "minimal"
+# Choices are Literal string sets: pydantic-core validates them with a single
+# membership check and the handlers work with plain strings
+Gender = Literal["M", "F"]
+FitnessLevel = Literal["beginner", "intermediate", "advanced", "expert"]
+FitnessGoal = Literal[
+    "muscle_gain",
+    "weight_loss",
+    "strength",
+    "endurance",
+    "athletic_performance",
+    "general_fitness",
+    "rehabilitation",
+]
+Equipment = Literal["bodyweight", "home_basic", "full_gym", "minimal"]
 
 
 class WorkoutRequest(BaseModel):
     # Personal data
     age: int = Field(..., ge=13, le=100, description="User age (13-100 years)")
-    gender: GenderEnum = Field(..., description="Biological sex")
+    gender: Gender = Field(..., description="Biological sex")
     weight: float = Field(..., gt=20, lt=300, description="Weight in kg")
     height: int = Field(..., ge=100, le=250, description="Height in cm")
 
     # Level and goals
-    fitness_level: FitnessLevelEnum = Field(..., description="Current fitness level")
-    primary_goal: FitnessGoalEnum = Field(..., description="Primary goal")
-    secondary_goals: List[FitnessGoalEnum] = Field(
-        default=[], max_items=2, description="Secondary goals (max 2)"
+    fitness_level: FitnessLevel = Field(..., description="Current fitness level")
+    primary_goal: FitnessGoal = Field(..., description="Primary goal")
+    secondary_goals: List[FitnessGoal] = Field(
+        default=[], max_length=2, description="Secondary goals (max 2)"
     )
 
     # Training parameters
@@ -62,11 +65,11 @@ class WorkoutRequest(BaseModel):
     session_duration: int = Field(
         default=60, ge=15, le=180, description="Desired session duration (minutes)"
     )
-    available_equipment: EquipmentEnum = Field(..., description="Available equipment")
+    available_equipment: Equipment = Field(..., description="Available equipment")
 
     # Constraints and preferences
     injuries_limitations: List[str] = Field(
-        default=[], max_items=5, description="Injuries or physical limitations"
+        default=[], max_length=5, description="Injuries or physical limitations"
     )
     preferred_workout_time: Optional[Literal["morning", "afternoon", "evening"]] = (
         Field(default=None, description="Preferred workout time")
@@ -75,14 +78,21 @@ class WorkoutRequest(BaseModel):
         default=0, ge=0, le=50, description="Years of training experience"
     )
 
-    @validator("secondary_goals")
-    def validate_secondary_goals(cls, v, values):
-        if "primary_goal" in values and values["primary_goal"] in v:
+    @field_validator("secondary_goals", mode="after")
+    @classmethod
+    def validate_secondary_goals(cls, v, info):
+        if "primary_goal" in info.data and info.data["primary_goal"] in v:
             raise ValueError("Secondary goal cannot be the same as primary goal")
         return v
 
 
+# Response models are built once per workout and never mutated
+_RESPONSE_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
 class Exercise(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+
     name: str = Field(..., description="Exercise name")
     muscle_groups: List[str] = Field(..., description="Target muscle groups")
     sets: int = Field(..., ge=1, le=10, description="Number of sets")
@@ -96,18 +106,24 @@ class Exercise(BaseModel):
 
 
 class WorkoutPhase(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+
     duration: str = Field(..., description="Phase duration")
     exercises: List[Exercise] = Field(..., description="Phase exercises")
     instructions: List[str] = Field(..., description="General instructions")
 
 
 class NutritionTip(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+
     category: str = Field(..., description="Category (pre/post workout, etc.)")
     recommendation: str = Field(..., description="Nutritional recommendation")
     timing: str = Field(..., description="Optimal timing")
 
 
 class WorkoutResponse(BaseModel):
+    model_config = _RESPONSE_MODEL_CONFIG
+
     # Workout structure
     warmup: WorkoutPhase = Field(..., description="Warm-up phase")
     main_workout: WorkoutPhase = Field(..., description="Main workout")
@@ -127,40 +143,22 @@ class WorkoutResponse(BaseModel):
     )
 
 
-def build_professional_prompt(req: WorkoutRequest) -> str:
-    """Build ultra-professional prompt for personalized workout generation"""
-
-    # BMI calculation for context
-    height_m = req.height / 100
-    bmi = round(req.weight / (height_m**2), 1)
-
-    # Handle limitations
-    limitations_text = ""
-    if req.injuries_limitations:
-        limitations_text = f"CRITICAL: Account for these limitations/injuries: {', '.join(req.injuries_limitations)}. "
+# The schema guides the JSON shape but is not strict, so it does not bound the
+# output length: keep the budget a complete workout structure needs
+WORKOUT_MAX_TOKENS = 1600
+_WORKOUT_SCHEMA = {"name": "workout", "schema": WorkoutResponse.model_json_schema()}
 
-    # Handle secondary goals properly (fix enum issue)
-    secondary_goals_str = (
-        ", ".join(g.value for g in req.secondary_goals)
-        if req.secondary_goals
-        else "none"
-    )
 
-    return f"""
+# Invariant instructions go first so providers that cache prompt prefixes
+# (OpenAI does this automatically) can reuse them across clients
+_STATIC_PROMPT_PREFIX = """
 You are an elite certified personal trainer creating a workout program.
 
-CLIENT: {req.age}yo {req.gender.value}, {req.weight}kg, {req.height}cm (BMI: {bmi})
-EXPERIENCE: {req.experience_years}yr, Level: {req.fitness_level.value}
-GOALS: Primary={req.primary_goal.value}, Secondary={secondary_goals_str}
-SCHEDULE: {req.sessions_per_week}x/week, {req.session_duration}min sessions
-EQUIPMENT: {req.available_equipment.value}
-{limitations_text}
-
 OUTPUT FORMAT (exact JSON structure):
-{{
-  "warmup": {{
+{
+  "warmup": {
     "duration": "X minutes",
-    "exercises": [{{
+    "exercises": [{
       "name": "string",
       "muscle_groups": ["string"],
       "sets": number,
@@ -168,12 +166,12 @@ OUTPUT FORMAT (exact JSON structure):
       "rest_time": "string",
       "intensity": "string",
       "technique_tips": ["string"]
-    }}],
+    }],
     "instructions": ["string"]
-  }},
-  "main_workout": {{
+  },
+  "main_workout": {
     "duration": "X minutes", 
-    "exercises": [{{
+    "exercises": [{
       "name": "string",
       "muscle_groups": ["string"],
       "sets": number,
@@ -181,13 +179,13 @@ OUTPUT FORMAT (exact JSON structure):
       "rest_time": "string", 
       "intensity": "string",
       "technique_tips": ["string"],
-      "modifications": {{"beginner": "string", "advanced": "string"}}
-    }}],
+      "modifications": {"beginner": "string", "advanced": "string"}
+    }],
     "instructions": ["string"]
-  }},
-  "cooldown": {{
+  },
+  "cooldown": {
     "duration": "X minutes",
-    "exercises": [{{
+    "exercises": [{
       "name": "string",
       "muscle_groups": ["string"], 
       "sets": number,
@@ -195,27 +193,27 @@ OUTPUT FORMAT (exact JSON structure):
       "rest_time": "string",
       "intensity": "string",
       "technique_tips": ["string"]
-    }}],
+    }],
     "instructions": ["string"]
-  }},
-  "workout_summary": {{
+  },
+  "workout_summary": {
     "total_time": "X minutes",
     "difficulty": "string",
     "focus": "string"
-  }},
+  },
   "progression_notes": ["string"],
-  "nutrition_tips": [{{
+  "nutrition_tips": [{
     "category": "string",
     "recommendation": "string", 
     "timing": "string"
-  }}],
+  }],
   "recovery_recommendations": ["string"],
-  "weekly_schedule_suggestion": {{
+  "weekly_schedule_suggestion": {
     "monday": "string",
     "wednesday": "string", 
     "friday": "string"
-  }}
-}}
+  }
+}
 
 REQUIREMENTS:
 - Create warmup (8-10min), main workout, cooldown (5-8min)
@@ -233,6 +231,118 @@ KEEP RESPONSES CONCISE:
 """
 
 
+def build_professional_prompt(req: WorkoutRequest) -> str:
+    """Build ultra-professional prompt for personalized workout generation"""
+    return _build_prompt_cached(
+        req.age,
+        req.gender,
+        req.weight,
+        req.height,
+        req.fitness_level,
+        req.primary_goal,
+        tuple(req.secondary_goals),
+        req.sessions_per_week,
+        req.session_duration,
+        req.available_equipment,
+        tuple(req.injuries_limitations),
+        req.experience_years,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _build_prompt_cached(
+    age: int,
+    gender: str,
+    weight: float,
+    height: int,
+    fitness_level: str,
+    primary_goal: str,
+    secondary_goals: Tuple[str, ...],
+    sessions_per_week: int,
+    session_duration: int,
+    equipment: str,
+    injuries_limitations: Tuple[str, ...],
+    experience_years: int,
+) -> str:
+    # BMI calculation for context
+    height_m = height / 100
+    bmi = round(weight / (height_m**2), 1)
+
+    # Handle limitations
+    limitations_text = ""
+    if injuries_limitations:
+        limitations_text = f"CRITICAL: Account for these limitations/injuries: {', '.join(injuries_limitations)}. "
+
+    # Handle secondary goals properly (fix enum issue)
+    secondary_goals_str = ", ".join(secondary_goals) if secondary_goals else "none"
+
+    return f"""{_STATIC_PROMPT_PREFIX}
+CLIENT: {age}yo {gender}, {weight}kg, {height}cm (BMI: {bmi})
+EXPERIENCE: {experience_years}yr, Level: {fitness_level}
+GOALS: Primary={primary_goal}, Secondary={secondary_goals_str}
+SCHEDULE: {sessions_per_week}x/week, {session_duration}min sessions
+EQUIPMENT: {equipment}
+{limitations_text}
+"""
+
+
+def _similarity_key(req: WorkoutRequest) -> str:
+    """
+    Coarse key shared by requests that would get an equivalent workout
+
+    Body metrics are bucketed to 5 years/kg/cm. Training experience and
+    parameters, equipment and limitations must match exactly.
+    """
+    bucket = (
+        req.age // 5,
+        int(req.weight) // 5,
+        req.height // 5,
+        req.gender,
+        req.experience_years,
+        req.fitness_level,
+        req.primary_goal,
+        tuple(sorted(req.secondary_goals)),
+        req.sessions_per_week,
+        req.session_duration,
+        req.available_equipment,
+        tuple(sorted(req.injuries_limitations)),
+    )
+    return make_key(PROMPT_VERSION, repr(bucket))
+
+
+def _cached_workout(req: WorkoutRequest, cache_key: str) -> Optional[Dict[str, Any]]:
+    cached = _workout_cache.get(cache_key)
+    if cached is None:
+        cached = _similar_workout_cache.get(_similarity_key(req))
+    return cached
+
+
+def _cache_workout(
+    req: WorkoutRequest, cache_key: str, workout: Dict[str, Any]
+) -> None:
+    _workout_cache.set(cache_key, workout)
+    _similar_workout_cache.set(_similarity_key(req), workout)
+
+
+async def _generate_workout(request: WorkoutRequest, cache_key: str) -> Dict[str, Any]:
+    """Call the LLM for a workout and cache the validated result"""
+    prompt = build_professional_prompt(request)
+    response = await ask_llm(
+        prompt, max_tokens=WORKOUT_MAX_TOKENS, response_schema=_WORKOUT_SCHEMA
+    )
+
+    # Never cache a workout that would fail response_model validation
+    try:
+        WorkoutResponse.model_validate(response)
+    except ValueError:  # pydantic's ValidationError
+        raise HTTPException(
+            status_code=500, detail="Incomplete workout structure received from AI"
+        )
+
+    _cache_workout(request, cache_key, response)
+    return response
+
+
 @router.post("/workout", response_model=WorkoutResponse, tags=["Fitness"])
 async def generate_personalized_workout(
     request: WorkoutRequest = Body(..., description="Personalized workout parameters")
@@ -252,29 +362,31 @@ async def generate_personalized_workout(
     """
     try:
         # Log without PII in production
-        if os.getenv("PRODUCTION"):
-            logger.info(f"Generating workout for goal: {request.primary_goal.value}")
-        else:
+        if IS_PRODUCTION:
+            logger.info("Generating workout for goal: %s", request.primary_goal)
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Generating workout for user: {request.age}yo {request.gender.value}, goal: {request.primary_goal.value}"
+                "Generating workout for user: %syo %s, goal: %s",
+                request.age,
+                request.gender,
+                request.primary_goal,
             )
 
-        prompt = build_professional_prompt(request)
-        response = ask_llm(
-            prompt, max_tokens=1600  # Increased for complete workout structure
-        )
+        cache_key = make_key(PROMPT_VERSION, request.model_dump_json())
+        cached = _cached_workout(request, cache_key)
+        if cached is not None:
+            logger.info("Workout served from cache")
+            return cached
 
-        # Additional response validation
-        if not all(key in response for key in ["warmup", "main_workout", "cooldown"]):
-            raise HTTPException(
-                status_code=500, detail="Incomplete workout structure received from AI"
-            )
+        response = await single_flight(
+            cache_key, lambda: _generate_workout(request, cache_key)
+        )
 
         logger.info("Workout generated successfully")
         return response
 
     except Exception as e:
-        logger.error(f"Error generating workout: {str(e)}")
+        logger.error("Error generating workout: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -285,117 +397,196 @@ async def generate_personalized_workout(
         )
 
 
+async def _stream_and_cache(
+    chunks: LLMStream, request: WorkoutRequest, cache_key: str
+) -> AsyncIterator[str]:
+    """Forward streamed chunks and cache the workout once it is complete"""
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+    finally:
+        # Stop generation upstream too when the client went away mid-stream
+        await chunks.aclose()
+
+    try:
+        workout = orjson.loads("".join(parts))
+        WorkoutResponse.model_validate(workout)
+    except ValueError:  # orjson.JSONDecodeError or pydantic's ValidationError
+        logger.warning("Streamed workout was incomplete, not caching it")
+        return
+    _cache_workout(request, cache_key, workout)
+
+
+@router.post("/workout/stream", tags=["Fitness"])
+async def stream_personalized_workout(
+    request: WorkoutRequest = Body(..., description="Personalized workout parameters")
+):
+    """
+    🏋️ Stream a personalized workout program while it is generated
+
+    Takes the same parameters as `/workout` and returns the same JSON
+    document, sent incrementally so clients can start parsing before
+    generation finishes. Complete workouts are cached and shared with
+    `/workout`.
+    """
+    cache_key = make_key(PROMPT_VERSION, request.model_dump_json())
+    cached = _cached_workout(request, cache_key)
+    if cached is not None:
+        logger.info("Workout served from cache")
+        return ORJSONResponse(cached)
+
+    chunks = await ask_llm_stream(
+        build_professional_prompt(request),
+        max_tokens=WORKOUT_MAX_TOKENS,
+        response_schema=_WORKOUT_SCHEMA,
+    )
+    # Frees the LLM slot even if the body is never iterated
+    return StreamingResponse(
+        _stream_and_cache(chunks, request, cache_key),
+        media_type="application/json",
+        background=BackgroundTask(chunks.aclose),
+    )
+
+
+_FITNESS_LEVELS = {
+    "fitness_levels": [
+        {
+            "id": "beginner",
+            "name": "Beginner",
+            "description": "New to exercise or returning after a long break",
+        },
+        {
+            "id": "intermediate",
+            "name": "Intermediate",
+            "description": "Regular exercise for 3-6 months",
+        },
+        {
+            "id": "advanced",
+            "name": "Advanced",
+            "description": "Consistent training for 1+ years",
+        },
+        {
+            "id": "expert",
+            "name": "Expert",
+            "description": "Advanced athlete or trainer level",
+        },
+    ]
+}
+_FITNESS_LEVELS_PAYLOAD = static_json(_FITNESS_LEVELS)
+
+
 @router.get("/fitness-levels")
-async def get_fitness_levels():
+async def get_fitness_levels(request: Request):
     """Get available fitness levels."""
-    return {
-        "fitness_levels": [
-            {
-                "id": "beginner",
-                "name": "Beginner",
-                "description": "New to exercise or returning after a long break",
-            },
-            {
-                "id": "intermediate",
-                "name": "Intermediate",
-                "description": "Regular exercise for 3-6 months",
-            },
-            {
-                "id": "advanced",
-                "name": "Advanced",
-                "description": "Consistent training for 1+ years",
-            },
-            {
-                "id": "expert",
-                "name": "Expert",
-                "description": "Advanced athlete or trainer level",
-            },
-        ]
-    }
+    return static_response(request, _FITNESS_LEVELS_PAYLOAD)
+
+
+_EQUIPMENT_OPTIONS = {
+    "equipment_options": [
+        {
+            "id": "bodyweight",
+            "name": "Bodyweight Only",
+            "description": "No equipment needed",
+        },
+        {
+            "id": "home_basic",
+            "name": "Home Basic",
+            "description": "Dumbbells, resistance bands",
+        },
+        {
+            "id": "home_gym",
+            "name": "Home Gym",
+            "description": "Full home gym setup",
+        },
+        {"id": "gym", "name": "Commercial Gym", "description": "Full gym access"},
+    ]
+}
+_EQUIPMENT_PAYLOAD = static_json(_EQUIPMENT_OPTIONS)
 
 
 @router.get("/equipment")
-async def get_equipment_options():
+async def get_equipment_options(request: Request):
     """Get available equipment options."""
-    return {
-        "equipment_options": [
-            {
-                "id": "bodyweight",
-                "name": "Bodyweight Only",
-                "description": "No equipment needed",
-            },
-            {
-                "id": "home_basic",
-                "name": "Home Basic",
-                "description": "Dumbbells, resistance bands",
-            },
-            {
-                "id": "home_gym",
-                "name": "Home Gym",
-                "description": "Full home gym setup",
-            },
-            {"id": "gym", "name": "Commercial Gym", "description": "Full gym access"},
-        ]
-    }
+    return static_response(request, _EQUIPMENT_PAYLOAD)
+
+
+_GOALS = {
+    "goals": [
+        {
+            "id": "weight_loss",
+            "name": "Weight Loss",
+            "description": "Burn fat and lose weight",
+        },
+        {
+            "id": "muscle_gain",
+            "name": "Muscle Gain",
+            "description": "Build muscle mass",
+        },
+        {
+            "id": "strength",
+            "name": "Strength",
+            "description": "Increase overall strength",
+        },
+        {
+            "id": "endurance",
+            "name": "Endurance",
+            "description": "Improve cardiovascular fitness",
+        },
+        {
+            "id": "general_fitness",
+            "name": "General Fitness",
+            "description": "Overall health and wellness",
+        },
+        {
+            "id": "athletic_performance",
+            "name": "Athletic Performance",
+            "description": "Sport-specific performance",
+        },
+    ]
+}
+_GOALS_PAYLOAD = static_json(_GOALS)
 
 
 @router.get("/goals")
-async def get_goals():
+async def get_goals(request: Request):
     """Get available fitness goals."""
-    return {
-        "goals": [
-            {
-                "id": "weight_loss",
-                "name": "Weight Loss",
-                "description": "Burn fat and lose weight",
-            },
-            {
-                "id": "muscle_gain",
-                "name": "Muscle Gain",
-                "description": "Build muscle mass",
-            },
-            {
-                "id": "strength",
-                "name": "Strength",
-                "description": "Increase overall strength",
-            },
-            {
-                "id": "endurance",
-                "name": "Endurance",
-                "description": "Improve cardiovascular fitness",
-            },
-            {
-                "id": "general_fitness",
-                "name": "General Fitness",
-                "description": "Overall health and wellness",
-            },
-            {
-                "id": "athletic_performance",
-                "name": "Athletic Performance",
-                "description": "Sport-specific performance",
-            },
-        ]
-    }
+    return static_response(request, _GOALS_PAYLOAD)
+
+
+# Everything above in one cacheable document, saving clients two round trips
+_META_PAYLOAD = static_json({**_FITNESS_LEVELS, **_EQUIPMENT_OPTIONS, **_GOALS})
+
+
+@router.get("/meta")
+async def get_meta(request: Request):
+    """Get fitness levels, equipment options and goals in one response."""
+    return static_response(request, _META_PAYLOAD)
+
+
+_GOAL_DESCRIPTIONS = {
+    "muscle_gain": "Muscle mass development and hypertrophy",
+    "weight_loss": "Weight loss and improved body composition",
+    "strength": "Maximal strength and power increase",
+    "endurance": "Cardiovascular and muscular endurance improvement",
+    "athletic_performance": "Sport-specific performance optimization",
+    "general_fitness": "Overall fitness improvement",
+    "rehabilitation": "Recovery and post-injury strengthening",
+}
 
 
 def _get_goal_description(goal: str) -> str:
-    descriptions = {
-        "muscle_gain": "Muscle mass development and hypertrophy",
-        "weight_loss": "Weight loss and improved body composition",
-        "strength": "Maximal strength and power increase",
-        "endurance": "Cardiovascular and muscular endurance improvement",
-        "athletic_performance": "Sport-specific performance optimization",
-        "general_fitness": "Overall fitness improvement",
-        "rehabilitation": "Recovery and post-injury strengthening",
-    }
-    return descriptions.get(goal, "Personalized fitness goal")
+    return _GOAL_DESCRIPTIONS.get(goal, "Personalized fitness goal")
+
+
+_EQUIPMENT_DESCRIPTIONS = {
+    "bodyweight": "Bodyweight exercises only",
+    "home_basic": "Basic home equipment (dumbbells, resistance bands)",
+    "full_gym": "Full gym access with complete equipment",
+    "minimal": "Minimal equipment (few weights, mat)",
+}
 
 
 def _get_equipment_description(equipment: str) -> str:
-    descriptions = {
-        "bodyweight": "Bodyweight exercises only",
-        "home_basic": "Basic home equipment (dumbbells, resistance bands)",
-        "full_gym": "Full gym access with complete equipment",
-        "minimal": "Minimal equipment (few weights, mat)",
-    }
-    return descriptions.get(equipment, "Custom equipment configuration")
+    return _EQUIPMENT_DESCRIPTIONS.get(equipment, "Custom equipment configuration")
@@ -1,16 +1,33 @@
+import asyncio
 import logging
 import os
 from enum import Enum
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Body, HTTPException
-from pydantic import BaseModel, Field, validator
+from fastapi import APIRouter, Body, Header, HTTPException, Request
+from pydantic import BaseModel, Field, model_validator
 
+from app.responses import ORJSONResponse, static_json, static_response
+from app.services.cache import TTLCache, make_key, single_flight
 from app.services.ia_client import ask_llm
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Environment is fixed for the lifetime of the process - read it once
+IS_PRODUCTION = bool(os.getenv("PRODUCTION"))
+
+# Upper bound on a single plan generation, retries included
+PLAN_TIMEOUT = 30
+
+# Profiles accepted by one /plan/batch request
+MAX_BATCH_SIZE = 8
+
+# Plans are keyed on the rendered prompt, so only inputs the LLM actually
+# sees split the cache. They are kept for a week.
+_plan_cache = TTLCache("nutrition_plan", maxsize=10_000, ttl=7 * 86400)
+
 
 class GenderEnum(str, Enum):
     MALE = "M"
@@ -67,16 +84,17 @@ class NutritionRequest(BaseModel):
 
     # Dietary preferences
     dietary_restrictions: List[DietaryRestrictionsEnum] = Field(
-        default=[], max_items=3, description="Dietary restrictions or preferences"
+        default=[], max_length=3, description="Dietary restrictions or preferences"
     )
-    allergies: List[str] = Field(
-        default=[], max_items=10, description="Food allergies or intolerances"
+    # Tuples are hashable, so they reach the cached prompt builder as sent
+    allergies: Tuple[str, ...] = Field(
+        default=(), max_length=10, description="Food allergies or intolerances"
     )
-    disliked_foods: List[str] = Field(
-        default=[], max_items=15, description="Foods to avoid"
+    disliked_foods: Tuple[str, ...] = Field(
+        default=(), max_length=15, description="Foods to avoid"
     )
-    preferred_foods: List[str] = Field(
-        default=[], max_items=15, description="Preferred foods"
+    preferred_foods: Tuple[str, ...] = Field(
+        default=(), max_length=15, description="Preferred foods"
     )
 
     # Lifestyle factors
@@ -95,27 +113,26 @@ class NutritionRequest(BaseModel):
 
     # Health considerations
     health_conditions: List[str] = Field(
-        default=[], max_items=5, description="Health conditions affecting nutrition"
+        default=[], max_length=5, description="Health conditions affecting nutrition"
     )
     medications: List[str] = Field(
-        default=[], max_items=5, description="Medications that may affect nutrition"
+        default=[], max_length=5, description="Medications that may affect nutrition"
     )
 
-    @validator("target_weight")
-    def validate_target_weight(cls, v, values):
-        if v is not None and "weight" in values:
-            if "nutrition_goal" in values:
-                goal = values["nutrition_goal"]
-                current = values["weight"]
-                if goal == NutritionGoalEnum.WEIGHT_LOSS and v >= current:
-                    raise ValueError(
-                        "Target weight must be lower than current weight for weight loss"
-                    )
-                elif goal == NutritionGoalEnum.WEIGHT_GAIN and v <= current:
-                    raise ValueError(
-                        "Target weight must be higher than current weight for weight gain"
-                    )
-        return v
+    @model_validator(mode="after")
+    def validate_target_weight(self):
+        target = self.target_weight
+        if target is not None:
+            goal = self.nutrition_goal
+            if goal == NutritionGoalEnum.WEIGHT_LOSS and target >= self.weight:
+                raise ValueError(
+                    "Target weight must be lower than current weight for weight loss"
+                )
+            elif goal == NutritionGoalEnum.WEIGHT_GAIN and target <= self.weight:
+                raise ValueError(
+                    "Target weight must be higher than current weight for weight gain"
+                )
+        return self
 
 
 class Macros(BaseModel):
@@ -199,97 +216,68 @@ class NutritionResponse(BaseModel):
     adjustment_guidelines: List[str] = Field(..., description="How to adjust the plan")
 
 
-def build_professional_nutrition_prompt(request: NutritionRequest) -> str:
-    """Build ultra-professional prompt for personalized nutrition plan generation"""
-
-    # BMR calculation using Mifflin-St Jeor equation
-    if request.gender == GenderEnum.MALE:
-        bmr = 10 * request.weight + 6.25 * request.height - 5 * request.age + 5
-    else:
-        bmr = 10 * request.weight + 6.25 * request.height - 5 * request.age - 161
-
-    # Activity multipliers
-    activity_multipliers = {
-        ActivityLevelEnum.SEDENTARY: 1.2,
-        ActivityLevelEnum.LIGHTLY_ACTIVE: 1.375,
-        ActivityLevelEnum.MODERATELY_ACTIVE: 1.55,
-        ActivityLevelEnum.VERY_ACTIVE: 1.725,
-        ActivityLevelEnum.EXTREMELY_ACTIVE: 1.9,
-    }
+# Sex-specific constant of the Mifflin-St Jeor equation
+_BMR_OFFSETS = {GenderEnum.MALE: 5, GenderEnum.FEMALE: -161}
 
-    tdee = round(bmr * activity_multipliers[request.activity_level])
+# Activity multipliers
+_ACTIVITY_MULTIPLIERS = {
+    ActivityLevelEnum.SEDENTARY: 1.2,
+    ActivityLevelEnum.LIGHTLY_ACTIVE: 1.375,
+    ActivityLevelEnum.MODERATELY_ACTIVE: 1.55,
+    ActivityLevelEnum.VERY_ACTIVE: 1.725,
+    ActivityLevelEnum.EXTREMELY_ACTIVE: 1.9,
+}
 
-    # Handle restrictions and allergies
-    restrictions_text = ""
-    if request.dietary_restrictions:
-        restrictions_str = ", ".join(r.value for r in request.dietary_restrictions)
-        restrictions_text += f"Diet: {restrictions_str}. "
 
-    if request.allergies:
-        restrictions_text += f"ALLERGIES: {', '.join(request.allergies)}. "
-
-    if request.disliked_foods:
-        restrictions_text += f"Avoid: {', '.join(request.disliked_foods)}. "
-
-    # Budget context
-    budget_text = (
-        f"Budget: {request.budget_per_week}€/week. " if request.budget_per_week else ""
-    )
-
-    return f"""
+# Invariant instructions go first so providers that cache prompt prefixes
+# (OpenAI does this automatically) can reuse them across clients
+_STATIC_PROMPT_PREFIX = """
 You are a certified nutritionist creating a nutrition plan.
 
-CLIENT: {request.age}yo {request.gender.value}, {request.weight}kg, {request.height}cm
-ACTIVITY: {request.activity_level.value}, BMR: {bmr:.0f} cal, TDEE: {tdee} cal
-GOAL: {request.nutrition_goal.value}, Timeline: {request.timeline_weeks}w
-TARGET: {request.target_weight or 'maintain current'}kg
-MEALS: {request.meals_per_day}/day, Cooking: {request.cooking_time_available}min
-{restrictions_text}{budget_text}
-
 OUTPUT FORMAT (exact JSON):
-{{
+{
   "daily_calories": number,
-  "daily_macros": {{"calories": number, "protein_g": number, "carbs_g": number, "fat_g": number}},
-  "meals": [{{
+  "daily_macros": {"calories": number, "protein_g": number, "carbs_g": number, "fat_g": number},
+  "meals": [{
     "name": "string",
     "time": "string", 
     "calories": number,
-    "macros": {{"calories": number, "protein_g": number, "carbs_g": number, "fat_g": number}},
+    "macros": {"calories": number, "protein_g": number, "carbs_g": number, "fat_g": number},
     "ingredients": ["string"],
     "preparation_time": number,
     "instructions": ["string"],
     "tips": ["string"]
-  }}],
-  "weekly_meal_prep": {{"sunday": ["string"], "wednesday": ["string"]}},
+  }],
+  "weekly_meal_prep": {"sunday": ["string"], "wednesday": ["string"]},
   "shopping_list": ["string"],
-  "recommended_supplements": [{{
+  "recommended_supplements": [{
     "name": "string",
     "dosage": "string", 
     "timing": "string",
     "purpose": "string",
     "interactions": ["string"]
-  }}],
-  "key_micronutrients": {{
+  }],
+  "key_micronutrients": {
     "vitamin_d_mcg": number,
     "vitamin_b12_mcg": number,
     "iron_mg": number,
     "calcium_mg": number,
     "omega3_g": number
-  }},
+  },
   "nutrition_education": ["string"],
-  "hydration_guidelines": {{
+  "hydration_guidelines": {
     "daily_water_liters": number,
-    "electrolyte_needs": {{"sodium": "string", "potassium": "string"}},
+    "electrolyte_needs": {"sodium": "string", "potassium": "string"},
     "timing_recommendations": ["string"]
-  }},
+  },
   "progress_metrics": ["string"],
   "adjustment_guidelines": ["string"]
-}}
+}
 
 REQUIREMENTS:
 - Calculate precise calories based on goal (deficit/surplus from TDEE)
-- Create {request.meals_per_day} balanced meals with exact macros
-- Cooking time ≤ {request.cooking_time_available}min per meal
+- Create the number of meals given in MEALS, balanced with exact macros
+- Keep cooking time per meal within the Cooking limit
 - Include weekly prep strategy and shopping list
 - Account for all restrictions and allergies
 
@@ -302,11 +290,150 @@ KEEP RESPONSES CONCISE:
 """
 
 
-@router.post("/plan", response_model=NutritionResponse, tags=["Nutrition"])
+def build_professional_nutrition_prompt(request: NutritionRequest) -> str:
+    """Build ultra-professional prompt for personalized nutrition plan generation"""
+    return _build_prompt_cached(
+        request.age,
+        request.gender.value,
+        request.weight,
+        request.height,
+        request.target_weight,
+        request.activity_level.value,
+        request.nutrition_goal.value,
+        request.timeline_weeks,
+        tuple(r.value for r in request.dietary_restrictions),
+        request.allergies,
+        request.disliked_foods,
+        request.meals_per_day,
+        request.cooking_time_available,
+        request.budget_per_week,
+    )
+
+
+@lru_cache(maxsize=512)
+def _build_prompt_cached(
+    age: int,
+    gender: str,
+    weight: float,
+    height: int,
+    target_weight: Optional[float],
+    activity_level: str,
+    nutrition_goal: str,
+    timeline_weeks: int,
+    dietary_restrictions: Tuple[str, ...],
+    allergies: Tuple[str, ...],
+    disliked_foods: Tuple[str, ...],
+    meals_per_day: int,
+    cooking_time_available: int,
+    budget_per_week: Optional[float],
+) -> str:
+    # BMR calculation using Mifflin-St Jeor equation
+    bmr = 10 * weight + 6.25 * height - 5 * age + _BMR_OFFSETS[gender]
+
+    tdee = round(bmr * _ACTIVITY_MULTIPLIERS[activity_level])
+
+    # Handle restrictions and allergies, joined in a single pass
+    restrictions = (
+        ("Diet", dietary_restrictions),
+        ("ALLERGIES", allergies),
+        ("Avoid", disliked_foods),
+    )
+    restrictions_text = "".join(
+        f"{label}: {', '.join(items)}. " for label, items in restrictions if items
+    )
+
+    # Budget context
+    budget_text = f"Budget: {budget_per_week}€/week. " if budget_per_week else ""
+
+    return f"""{_STATIC_PROMPT_PREFIX}
+CLIENT: {age}yo {gender}, {weight}kg, {height}cm
+ACTIVITY: {activity_level}, BMR: {bmr:.0f} cal, TDEE: {tdee} cal
+GOAL: {nutrition_goal}, Timeline: {timeline_weeks}w
+TARGET: {target_weight or 'maintain current'}kg
+MEALS: {meals_per_day}/day, Cooking: {cooking_time_available}min
+{restrictions_text}{budget_text}
+"""
+
+
+# The schema is not strict, so the output length is not bounded by it. Never
+# go below the 1200 tokens a complete plan needs, and grow past that with the
+# number of meals requested: a fixed share for the sections around the meals
+# plus an allowance per meal
+_PLAN_MIN_TOKENS = 1200
+_PLAN_BASE_TOKENS = 480
+_PLAN_TOKENS_PER_MEAL = 180
+_PLAN_SCHEMA = {
+    "name": "nutrition_plan",
+    "schema": NutritionResponse.model_json_schema(),
+}
+
+
+def _plan_max_tokens(meals_per_day: int) -> int:
+    return max(
+        _PLAN_MIN_TOKENS, _PLAN_BASE_TOKENS + meals_per_day * _PLAN_TOKENS_PER_MEAL
+    )
+
+
+async def _generate_plan(
+    prompt: str, cache_key: str, max_tokens: int
+) -> Dict[str, Any]:
+    """Call the LLM for a plan and cache it once it passed validation"""
+    response = await asyncio.wait_for(
+        ask_llm(prompt, max_tokens=max_tokens, response_schema=_PLAN_SCHEMA),
+        timeout=PLAN_TIMEOUT,
+    )
+
+    # Never cache a plan that would fail NutritionResponse validation
+    try:
+        NutritionResponse.model_validate(response)
+    except ValueError:  # pydantic's ValidationError
+        raise HTTPException(
+            status_code=500, detail="Incomplete nutrition plan received from AI"
+        )
+
+    _plan_cache.set(cache_key, response)
+    logger.info("Nutrition plan generated successfully")
+    return response
+
+
+async def _get_plan(
+    request: NutritionRequest, use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Plan for ``request`` from the cache, or generated by the LLM
+
+    Concurrent callers with the same prompt share a single LLM call.
+    """
+    prompt = build_professional_nutrition_prompt(request)
+    cache_key = make_key(prompt)
+    if use_cache:
+        cached = _plan_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Nutrition plan served from cache")
+            return cached
+
+    max_tokens = _plan_max_tokens(request.meals_per_day)
+    return await single_flight(
+        cache_key, lambda: _generate_plan(prompt, cache_key, max_tokens)
+    )
+
+
+# No response_model: the plan is validated once when generated, then sent as
+# returned by the LLM instead of being re-validated and re-encoded field by
+# field on every response. The model still documents it.
+@router.post(
+    "/plan",
+    response_class=ORJSONResponse,
+    responses={200: {"model": NutritionResponse}},
+    tags=["Nutrition"],
+)
 async def generate_nutrition_plan(
     request: NutritionRequest = Body(
         ..., description="Personalized nutrition parameters"
-    )
+    ),
+    cache_control: Optional[str] = Header(
+        None, description="Send `no-cache` to generate a fresh plan"
+    ),
 ):
     """
     🥗 Generate ultra-personalized nutrition plan
@@ -323,33 +450,34 @@ async def generate_nutrition_plan(
     """
     try:
         # Log without PII in production
-        if os.getenv("PRODUCTION"):
+        if IS_PRODUCTION:
             logger.info(
-                f"Generating nutrition plan for goal: {request.nutrition_goal.value}"
+                "Generating nutrition plan for goal: %s", request.nutrition_goal.value
             )
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Generating nutrition plan for user: {request.age}yo {request.gender.value}, goal: {request.nutrition_goal.value}"
+                "Generating nutrition plan for user: %syo %s, goal: %s",
+                request.age,
+                request.gender.value,
+                request.nutrition_goal.value,
             )
 
-        prompt = build_professional_nutrition_prompt(request)
-        response = ask_llm(
-            prompt, max_tokens=1200  # Increased for complete nutrition plans
-        )
-
-        # Additional response validation
-        if not all(
-            key in response for key in ["daily_calories", "daily_macros", "meals"]
-        ):
-            raise HTTPException(
-                status_code=500, detail="Incomplete nutrition plan received from AI"
-            )
+        use_cache = not (cache_control and "no-cache" in cache_control)
+        response = await _get_plan(request, use_cache=use_cache)
+        return ORJSONResponse(response)
 
-        logger.info("Nutrition plan generated successfully")
-        return response
+    except asyncio.TimeoutError:
+        logger.error("Nutrition plan generation timed out after %ss", PLAN_TIMEOUT)
+        raise HTTPException(
+            status_code=504,
+            detail={
+                "error": "Nutrition plan generation timed out",
+                "message": "The AI service took too long to respond. Please try again.",
+            },
+        )
 
     except Exception as e:
-        logger.error(f"Error generating nutrition plan: {str(e)}")
+        logger.error("Error generating nutrition plan: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -360,10 +488,85 @@ async def generate_nutrition_plan(
         )
 
 
-@router.get("/goals", tags=["Nutrition"])
-async def get_nutrition_goals():
-    """📊 Get available nutrition goals"""
-    return {
+class NutritionBatchRequest(BaseModel):
+    requests: List[NutritionRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Profiles to plan for (max {MAX_BATCH_SIZE})",
+    )
+
+
+@router.post("/plan/batch", response_class=ORJSONResponse, tags=["Nutrition"])
+async def generate_nutrition_plans(
+    batch: NutritionBatchRequest = Body(..., description="Several nutrition profiles")
+):
+    """
+    🥗 Generate several nutrition plans in one request
+
+    Plans are generated concurrently and returned in request order. A plan
+    that fails is replaced by an `error` object so the others still arrive.
+    """
+    results = await asyncio.gather(
+        *(_get_plan(request) for request in batch.requests), return_exceptions=True
+    )
+
+    plans = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("Error generating batched nutrition plan: %s", result)
+            plans.append({"error": "Nutrition plan generation failed"})
+        else:
+            plans.append(result)
+    return ORJSONResponse({"plans": plans})
+
+
+_NUTRITION_GOAL_DESCRIPTIONS = {
+    "weight_loss": "Sustainable weight loss with preserved muscle mass",
+    "weight_gain": "Healthy weight gain with optimal body composition",
+    "muscle_gain": "Muscle mass development with strategic nutrition",
+    "maintenance": "Weight maintenance with optimal health",
+    "athletic_performance": "Performance optimization through nutrition",
+    "general_health": "Overall health improvement through balanced nutrition",
+}
+
+
+def _get_nutrition_goal_description(goal: str) -> str:
+    return _NUTRITION_GOAL_DESCRIPTIONS.get(goal, "Personalized nutrition goal")
+
+
+_RESTRICTION_DESCRIPTIONS = {
+    "none": "No dietary restrictions",
+    "vegetarian": "Plant-based diet with dairy and eggs",
+    "vegan": "Strictly plant-based diet",
+    "keto": "Very low carb, high fat ketogenic diet",
+    "mediterranean": "Mediterranean-style eating pattern",
+    "paleo": "Paleolithic diet principles",
+    "gluten_free": "Gluten-free diet for celiac or sensitivity",
+    "dairy_free": "Lactose-free and dairy-free options",
+    "low_carb": "Reduced carbohydrate intake",
+}
+
+
+def _get_restriction_description(restriction: str) -> str:
+    return _RESTRICTION_DESCRIPTIONS.get(restriction, "Custom dietary approach")
+
+
+_ACTIVITY_DESCRIPTIONS = {
+    "sedentary": "Little to no exercise (desk job)",
+    "lightly_active": "Light exercise 1-3 days/week",
+    "moderately_active": "Moderate exercise 3-5 days/week",
+    "very_active": "Heavy exercise 6-7 days/week",
+    "extremely_active": "Very heavy exercise, 2x/day or physical job",
+}
+
+
+def _get_activity_description(activity: str) -> str:
+    return _ACTIVITY_DESCRIPTIONS.get(activity, "Custom activity level")
+
+
+_GOALS_PAYLOAD = static_json(
+    {
         "goals": [
             {
                 "id": goal.value,
@@ -373,12 +576,17 @@ async def get_nutrition_goals():
             for goal in NutritionGoalEnum
         ]
     }
+)
 
 
-@router.get("/restrictions", tags=["Nutrition"])
-async def get_dietary_restrictions():
-    """🚫 Get available dietary restrictions"""
-    return {
+@router.get("/goals", tags=["Nutrition"])
+async def get_nutrition_goals(request: Request):
+    """📊 Get available nutrition goals"""
+    return static_response(request, _GOALS_PAYLOAD)
+
+
+_RESTRICTIONS_PAYLOAD = static_json(
+    {
         "restrictions": [
             {
                 "id": restriction.value,
@@ -388,12 +596,17 @@ async def get_dietary_restrictions():
             for restriction in DietaryRestrictionsEnum
         ]
     }
+)
 
 
-@router.get("/activity-levels", tags=["Nutrition"])
-async def get_activity_levels():
-    """🏃 Get activity level options"""
-    return {
+@router.get("/restrictions", tags=["Nutrition"])
+async def get_dietary_restrictions(request: Request):
+    """🚫 Get available dietary restrictions"""
+    return static_response(request, _RESTRICTIONS_PAYLOAD)
+
+
+_ACTIVITY_LEVELS_PAYLOAD = static_json(
+    {
         "activity_levels": [
             {
                 "id": level.value,
@@ -403,12 +616,17 @@ async def get_activity_levels():
             for level in ActivityLevelEnum
         ]
     }
+)
 
 
-@router.get("/dietary-preferences")
-async def get_dietary_preferences():
-    """Get available dietary preferences."""
-    return {
+@router.get("/activity-levels", tags=["Nutrition"])
+async def get_activity_levels(request: Request):
+    """🏃 Get activity level options"""
+    return static_response(request, _ACTIVITY_LEVELS_PAYLOAD)
+
+
+_DIETARY_PREFERENCES_PAYLOAD = static_json(
+    {
         "dietary_preferences": [
             {
                 "id": "no_restrictions",
@@ -463,80 +681,10 @@ async def get_dietary_preferences():
             },
         ]
     }
+)
 
 
-@router.get("/goals")
-async def get_goals():
-    """Get available nutrition goals."""
-    return {
-        "goals": [
-            {
-                "id": "weight_loss",
-                "name": "Weight Loss",
-                "description": "Lose body weight",
-            },
-            {
-                "id": "weight_gain",
-                "name": "Weight Gain",
-                "description": "Gain healthy weight",
-            },
-            {
-                "id": "muscle_gain",
-                "name": "Muscle Gain",
-                "description": "Build muscle mass",
-            },
-            {
-                "id": "maintenance",
-                "name": "Maintenance",
-                "description": "Maintain current weight",
-            },
-            {
-                "id": "general_health",
-                "name": "General Health",
-                "description": "Overall health improvement",
-            },
-            {
-                "id": "athletic_performance",
-                "name": "Athletic Performance",
-                "description": "Optimize performance",
-            },
-        ]
-    }
-
-
-def _get_nutrition_goal_description(goal: str) -> str:
-    descriptions = {
-        "weight_loss": "Sustainable weight loss with preserved muscle mass",
-        "weight_gain": "Healthy weight gain with optimal body composition",
-        "muscle_gain": "Muscle mass development with strategic nutrition",
-        "maintenance": "Weight maintenance with optimal health",
-        "athletic_performance": "Performance optimization through nutrition",
-        "general_health": "Overall health improvement through balanced nutrition",
-    }
-    return descriptions.get(goal, "Personalized nutrition goal")
-
-
-def _get_restriction_description(restriction: str) -> str:
-    descriptions = {
-        "none": "No dietary restrictions",
-        "vegetarian": "Plant-based diet with dairy and eggs",
-        "vegan": "Strictly plant-based diet",
-        "keto": "Very low carb, high fat ketogenic diet",
-        "mediterranean": "Mediterranean-style eating pattern",
-        "paleo": "Paleolithic diet principles",
-        "gluten_free": "Gluten-free diet for celiac or sensitivity",
-        "dairy_free": "Lactose-free and dairy-free options",
-        "low_carb": "Reduced carbohydrate intake",
-    }
-    return descriptions.get(restriction, "Custom dietary approach")
-
-
-def _get_activity_description(activity: str) -> str:
-    descriptions = {
-        "sedentary": "Little to no exercise (desk job)",
-        "lightly_active": "Light exercise 1-3 days/week",
-        "moderately_active": "Moderate exercise 3-5 days/week",
-        "very_active": "Heavy exercise 6-7 days/week",
-        "extremely_active": "Very heavy exercise, 2x/day or physical job",
-    }
-    return descriptions.get(activity, "Custom activity level")
+@router.get("/dietary-preferences")
+async def get_dietary_preferences(request: Request):
+    """Get available dietary preferences."""
+    return static_response(request, _DIETARY_PREFERENCES_PAYLOAD)
@@ -1,16 +1,41 @@
 import logging
 import os
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Body, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
+from starlette.background import BackgroundTask
 
-from app.services.ia_client import ask_llm
+from app.responses import static_json, static_response
+from app.services import ia_client
+from app.services.cache import TTLCache, make_key
+from app.services.ia_client import LLMStream, ask_llm, ask_llm_stream
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+IS_PRODUCTION = bool(os.getenv("PRODUCTION"))
+
+# Default budget, increased to 2000 tokens for complete responses
+TIPS_MAX_TOKENS = 2000
+MAX_BATCH_SIZE = 100
+
+# Serialized responses of recent requests, keyed by the canonical request JSON
+_tips_cache = TTLCache("tips", maxsize=2048, ttl=3600)
+_TIPS_HEADERS = {"Cache-Control": "private, max-age=600"}
+_CACHED_TIPS_HEADERS = {**_TIPS_HEADERS, "X-Cache": "HIT"}
+# Free-text lists whose order, case and spacing do not change the tips
+_CANONICAL_LIST_FIELDS = (
+    "secondary_domains",
+    "current_challenges",
+    "specific_goals",
+    "lifestyle_factors",
+    "equipment_access",
+)
+
 
 class DomainEnum(str, Enum):
     FITNESS = "fitness"
@@ -38,6 +63,19 @@ class TipFormatEnum(str, Enum):
     PRACTICAL_HACKS = "practical_hacks"
 
 
+# Generation budget per (format, complexity). Short formats finish well below
+# the default, long-form ones at high complexity need a little more room
+_TIPS_MAX_TOKENS = {
+    (TipFormatEnum.QUICK_TIPS, "simple"): 1200,
+    (TipFormatEnum.QUICK_TIPS, "moderate"): 1500,
+    (TipFormatEnum.PRACTICAL_HACKS, "simple"): 1400,
+    (TipFormatEnum.PRACTICAL_HACKS, "moderate"): 1700,
+    (TipFormatEnum.DETAILED_GUIDE, "complex"): 2400,
+    (TipFormatEnum.STEP_BY_STEP, "complex"): 2200,
+    (TipFormatEnum.SCIENCE_BASED, "complex"): 2400,
+}
+
+
 class TipsRequest(BaseModel):
     # Core request parameters
     domain: DomainEnum = Field(..., description="Primary domain for tips")
@@ -106,6 +144,14 @@ class Tip(BaseModel):
     )
 
 
+class QuickTip(BaseModel):
+    title: str = Field(..., description="Tip title")
+    description: str = Field(..., description="Detailed description")
+    action_steps: List[str] = Field(..., description="Step-by-step action items")
+    benefits: List[str] = Field(..., description="Expected benefits")
+    time_required: str = Field(..., description="Time required to implement")
+
+
 class TipsResponse(BaseModel):
     # Core tips
     tips: List[Tip] = Field(..., description="Personalized tips")
@@ -139,60 +185,16 @@ class TipsResponse(BaseModel):
     )
 
 
-def build_professional_tips_prompt(request: TipsRequest) -> str:
-    """Build ultra-professional prompt for personalized tips generation"""
-
-    # Handle secondary domains properly (fix enum issue)
-    secondary_domains_str = (
-        ", ".join(d.value for d in request.secondary_domains)
-        if request.secondary_domains
-        else "none"
-    )
-
-    # Context building
-    challenges_text = (
-        f"Current challenges: {', '.join(request.current_challenges)}. "
-        if request.current_challenges
-        else ""
-    )
-    goals_text = (
-        f"Specific goals: {', '.join(request.specific_goals)}. "
-        if request.specific_goals
-        else ""
-    )
-    lifestyle_text = (
-        f"Lifestyle factors: {', '.join(request.lifestyle_factors)}. "
-        if request.lifestyle_factors
-        else ""
-    )
-    equipment_text = (
-        f"Available equipment: {', '.join(request.equipment_access)}. "
-        if request.equipment_access
-        else ""
-    )
-    time_text = (
-        f"Time available: {request.time_constraints} min/day. "
-        if request.time_constraints
-        else ""
-    )
-    age_text = f"Age group: {request.age_range}. " if request.age_range else ""
-
-    return f"""
+# Invariant instructions go first so providers that cache prompt prefixes
+# (OpenAI does this automatically) can reuse them across clients
+_STATIC_PROMPT_PREFIX = """
 You are a certified health and wellness coach with expertise across fitness, nutrition, mental health, and lifestyle optimization.
 
-CLIENT PROFILE:
-- Primary focus: {request.domain.value}
-- Secondary interests: {secondary_domains_str}
-- Experience level: {request.experience_level.value}
-- Preferred format: {request.format_preference.value}
-- Complexity preference: {request.preferred_complexity}
-{challenges_text}{goals_text}{time_text}{age_text}{lifestyle_text}{equipment_text}
-
 REQUIREMENTS:
-1. Generate 4-5 highly actionable tips specifically for {request.domain.value}
+1. Generate 4-5 highly actionable tips specifically for the primary focus
 2. Each string field ≤ 120 characters, arrays ≤ 6 items
-3. Tips must be appropriate for {request.experience_level.value} level
-4. Format according to {request.format_preference.value} style
+3. Tips must be appropriate for the client's experience level
+4. Format according to the preferred format style
 5. Include scientific rationale where relevant
 6. Provide implementation strategy and priority order
 7. Address stated challenges and goals specifically
@@ -217,8 +219,8 @@ CRITICAL CONSTRAINTS:
 - Address motivation and adherence strategies
 
 OUTPUT FORMAT (exact JSON structure):
-{{
-  "tips": [{{
+{
+  "tips": [{
     "title": "string",
     "category": "string",
     "difficulty": "easy|medium|hard",
@@ -229,12 +231,12 @@ OUTPUT FORMAT (exact JSON structure):
     "common_mistakes": ["string"],
     "scientific_rationale": "string",
     "progression_tips": ["string"]
-  }}],
-  "implementation_strategy": {{
+  }],
+  "implementation_strategy": {
     "start_with": "string",
     "timeline": "string",
     "key_principles": ["string"]
-  }},
+  },
   "priority_order": ["string"],
   "tracking_methods": ["string"],
   "success_indicators": ["string"],
@@ -242,13 +244,90 @@ OUTPUT FORMAT (exact JSON structure):
   "advanced_techniques": ["string"],
   "common_obstacles": ["string"],
   "motivation_strategies": ["string"]
-}}
+}
 
 Focus on practical application, scientific accuracy, and personalized relevance.
 """
 
 
-@router.post("/generate", response_model=TipsResponse, tags=["Tips & Advice"])
+def build_professional_tips_prompt(request: TipsRequest) -> str:
+    """Build ultra-professional prompt for personalized tips generation"""
+
+    # Handle secondary domains properly (fix enum issue)
+    secondary_domains_str = (
+        ", ".join(d.value for d in request.secondary_domains)
+        if request.secondary_domains
+        else "none"
+    )
+
+    # Context building: one "label: value. " fragment per field that is set
+    time_available = (
+        f"{request.time_constraints} min/day" if request.time_constraints else ""
+    )
+    context = (
+        ("Current challenges", ", ".join(request.current_challenges)),
+        ("Specific goals", ", ".join(request.specific_goals)),
+        ("Time available", time_available),
+        ("Age group", request.age_range or ""),
+        ("Lifestyle factors", ", ".join(request.lifestyle_factors)),
+        ("Available equipment", ", ".join(request.equipment_access or ())),
+    )
+    context_text = "".join(f"{label}: {value}. " for label, value in context if value)
+
+    return f"""{_STATIC_PROMPT_PREFIX}
+CLIENT PROFILE:
+- Primary focus: {request.domain.value}
+- Secondary interests: {secondary_domains_str}
+- Experience level: {request.experience_level.value}
+- Preferred format: {request.format_preference.value}
+- Complexity preference: {request.preferred_complexity}
+{context_text}
+"""
+
+
+def _tips_cache_key(request: TipsRequest) -> str:
+    """Key shared by requests that only differ in list order, case or spacing"""
+    fields = request.model_dump(mode="json")
+    for name in _CANONICAL_LIST_FIELDS:
+        if fields[name]:
+            fields[name] = sorted({" ".join(v.lower().split()) for v in fields[name]})
+    return make_key(orjson.dumps(fields, option=orjson.OPT_SORT_KEYS).decode())
+
+
+def _tips_max_tokens(request: TipsRequest) -> int:
+    key = (request.format_preference, request.preferred_complexity)
+    return _TIPS_MAX_TOKENS.get(key, TIPS_MAX_TOKENS)
+
+
+def _encode_tips(response: Dict[str, Any]) -> bytes:
+    """
+    Check a tips response from the LLM and encode it as TipsResponse JSON
+
+    The result is validated and encoded once, then replayed as-is on cache
+    hits.
+    """
+    # Additional response validation
+    if not all(
+        key in response for key in ["tips", "implementation_strategy", "priority_order"]
+    ):
+        raise HTTPException(
+            status_code=500, detail="Incomplete tips response received from AI"
+        )
+
+    # Validate tips structure
+    if not response.get("tips") or len(response["tips"]) < 3:
+        raise HTTPException(
+            status_code=500, detail="Insufficient number of tips generated"
+        )
+
+    return TipsResponse.model_validate(response).model_dump_json().encode()
+
+
+# No response_model: the handler sends the bytes _encode_tips produced, which
+# were validated once already. The model still documents the response.
+@router.post(
+    "/generate", responses={200: {"model": TipsResponse}}, tags=["Tips & Advice"]
+)
 async def generate_personalized_tips(
     request: TipsRequest = Body(..., description="Personalized tips parameters")
 ):
@@ -267,42 +346,37 @@ async def generate_personalized_tips(
     """
     try:
         # Log without PII in production
-        if os.getenv("PRODUCTION"):
+        if IS_PRODUCTION:
             logger.info(
-                f"Generating tips for domain: {request.domain.value}, level: {request.experience_level.value}"
+                "Generating tips for domain: %s, level: %s",
+                request.domain.value,
+                request.experience_level.value,
             )
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Generating tips for user: {request.domain.value}, level: {request.experience_level.value}"
+                "Generating tips for user: %s, level: %s",
+                request.domain.value,
+                request.experience_level.value,
             )
 
-        prompt = build_professional_tips_prompt(request)
-        response = ask_llm(
-            prompt,
-            max_tokens=2000,  # Increased to 2000 tokens for complete responses
-            force_json=True,  # Native JSON mode for guaranteed valid output
-        )
-
-        # Additional response validation
-        if not all(
-            key in response
-            for key in ["tips", "implementation_strategy", "priority_order"]
-        ):
-            raise HTTPException(
-                status_code=500, detail="Incomplete tips response received from AI"
+        cache_key = _tips_cache_key(request)
+        cached = _tips_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Tips served from cache")
+            return Response(
+                cached, media_type="application/json", headers=_CACHED_TIPS_HEADERS
             )
 
-        # Validate tips structure
-        if not response.get("tips") or len(response["tips"]) < 3:
-            raise HTTPException(
-                status_code=500, detail="Insufficient number of tips generated"
-            )
+        prompt = build_professional_tips_prompt(request)
+        response = await ask_llm(prompt, max_tokens=_tips_max_tokens(request))
 
+        body = _encode_tips(response)
+        _tips_cache.set(cache_key, body)
         logger.info("Tips generated successfully")
-        return response
+        return Response(body, media_type="application/json", headers=_TIPS_HEADERS)
 
     except Exception as e:
-        logger.error(f"Error generating tips: {str(e)}")
+        logger.error("Error generating tips: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -313,10 +387,147 @@ async def generate_personalized_tips(
         )
 
 
-@router.get("/domains", tags=["Tips & Advice"])
-async def get_available_domains():
-    """📚 Get available tip domains"""
-    return {
+async def _stream_and_cache(chunks: LLMStream, cache_key: str) -> AsyncIterator[str]:
+    """Forward streamed chunks and cache the tips once they are complete"""
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+    finally:
+        # Stop generation upstream too when the client went away mid-stream
+        await chunks.aclose()
+
+    try:
+        body = _encode_tips(orjson.loads("".join(parts)))
+    except (ValueError, HTTPException):  # Invalid JSON or incomplete tips
+        logger.warning("Streamed tips were incomplete, not caching them")
+        return
+    _tips_cache.set(cache_key, body)
+
+
+@router.post(
+    "/generate/stream",
+    responses={200: {"model": TipsResponse}},
+    tags=["Tips & Advice"],
+)
+async def stream_personalized_tips(
+    request: TipsRequest = Body(..., description="Personalized tips parameters")
+):
+    """
+    💡 Stream personalized tips while they are generated
+
+    Takes the same parameters as `/generate` and returns the same JSON
+    document, sent incrementally so clients can start rendering before
+    generation finishes. Complete responses are cached and shared with
+    `/generate`.
+    """
+    cache_key = _tips_cache_key(request)
+    cached = _tips_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Tips served from cache")
+        return Response(
+            cached, media_type="application/json", headers=_CACHED_TIPS_HEADERS
+        )
+
+    chunks = await ask_llm_stream(
+        build_professional_tips_prompt(request), max_tokens=_tips_max_tokens(request)
+    )
+    # Frees the LLM slot even if the body is never iterated
+    return StreamingResponse(
+        _stream_and_cache(chunks, cache_key),
+        media_type="application/json",
+        background=BackgroundTask(chunks.aclose),
+    )
+
+
+class TipsBatchRequest(BaseModel):
+    requests: List[TipsRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Tips requests to generate offline (max {MAX_BATCH_SIZE})",
+    )
+
+
+@router.post("/generate-batch", tags=["Tips & Advice"])
+async def submit_tips_batch(
+    batch: TipsBatchRequest = Body(..., description="Several tips requests")
+):
+    """
+    📦 Queue several tips requests for offline generation
+
+    The requests are sent to the OpenAI Batch API, which costs half as much
+    and completes within 24 hours. Poll `/batch/{batch_id}` for the results.
+    """
+    prompts = [build_professional_tips_prompt(request) for request in batch.requests]
+    # One budget per batch, large enough for its most demanding request
+    max_tokens = max(_tips_max_tokens(request) for request in batch.requests)
+    batch_id = await ia_client.submit_batch(prompts, max_tokens=max_tokens)
+    return {"batch_id": batch_id, "status": "submitted"}
+
+
+@router.get("/batch/{batch_id}", tags=["Tips & Advice"])
+async def get_tips_batch(batch_id: str):
+    """
+    📦 Status of a queued tips batch, with its tips once completed
+
+    Tips are returned in request order. A request that failed is replaced by
+    an `error` object so the others still arrive.
+    """
+    batch = await ia_client.get_batch_results(batch_id)
+    response: Dict[str, Any] = {"batch_id": batch["id"], "status": batch["status"]}
+    if batch["results"] is not None:
+        response["tips"] = [
+            result if result else {"error": "Tips generation failed"}
+            for result in batch["results"]
+        ]
+    return response
+
+
+_DOMAIN_DESCRIPTIONS = {
+    "fitness": "Exercise, training, and physical performance optimization",
+    "nutrition": "Diet, meal planning, and nutritional strategies",
+    "mental_health": "Stress management, mindfulness, and emotional wellbeing",
+    "sleep": "Sleep quality, hygiene, and recovery optimization",
+    "hydration": "Optimal fluid intake and electrolyte balance",
+    "recovery": "Rest, regeneration, and injury prevention",
+    "motivation": "Goal setting, habit formation, and adherence strategies",
+    "lifestyle": "Daily routines, time management, and life balance",
+}
+
+
+def _get_domain_description(domain: str) -> str:
+    return _DOMAIN_DESCRIPTIONS.get(domain, "Specialized health and wellness guidance")
+
+
+_FORMAT_DESCRIPTIONS = {
+    "quick_tips": "Concise, immediately actionable advice",
+    "detailed_guide": "Comprehensive explanations with full context",
+    "step_by_step": "Clear sequential instructions for implementation",
+    "science_based": "Research-backed recommendations with evidence",
+    "practical_hacks": "Efficient shortcuts and optimization techniques",
+}
+
+
+def _get_format_description(format_type: str) -> str:
+    return _FORMAT_DESCRIPTIONS.get(format_type, "Custom tip format")
+
+
+_LEVEL_DESCRIPTIONS = {
+    "beginner": "New to the domain, needs foundational guidance",
+    "intermediate": "Some experience, ready for structured approaches",
+    "advanced": "Significant experience, seeking optimization",
+    "expert": "Extensive knowledge, interested in cutting-edge techniques",
+}
+
+
+def _get_level_description(level: str) -> str:
+    return _LEVEL_DESCRIPTIONS.get(level, "Custom experience level")
+
+
+_DOMAINS_PAYLOAD = static_json(
+    {
         "domains": [
             {
                 "id": domain.value,
@@ -326,12 +537,17 @@ async def get_available_domains():
             for domain in DomainEnum
         ]
     }
+)
 
 
-@router.get("/formats", tags=["Tips & Advice"])
-async def get_tip_formats():
-    """📋 Get available tip formats"""
-    return {
+@router.get("/domains", tags=["Tips & Advice"])
+async def get_available_domains(request: Request):
+    """📚 Get available tip domains"""
+    return static_response(request, _DOMAINS_PAYLOAD)
+
+
+_FORMATS_PAYLOAD = static_json(
+    {
         "formats": [
             {
                 "id": format_type.value,
@@ -341,12 +557,17 @@ async def get_tip_formats():
             for format_type in TipFormatEnum
         ]
     }
+)
 
 
-@router.get("/experience-levels", tags=["Tips & Advice"])
-async def get_experience_levels():
-    """📈 Get experience level options"""
-    return {
+@router.get("/formats", tags=["Tips & Advice"])
+async def get_tip_formats(request: Request):
+    """📋 Get available tip formats"""
+    return static_response(request, _FORMATS_PAYLOAD)
+
+
+_EXPERIENCE_LEVELS_PAYLOAD = static_json(
+    {
         "levels": [
             {
                 "id": level.value,
@@ -356,12 +577,17 @@ async def get_experience_levels():
             for level in ExperienceLevelEnum
         ]
     }
+)
 
 
-@router.get("/fitness-levels", tags=["Tips & Advice"])
-async def get_fitness_levels():
-    """📈 Get fitness level options (alias for experience-levels)"""
-    return {
+@router.get("/experience-levels", tags=["Tips & Advice"])
+async def get_experience_levels(request: Request):
+    """📈 Get experience level options"""
+    return static_response(request, _EXPERIENCE_LEVELS_PAYLOAD)
+
+
+_FITNESS_LEVELS_PAYLOAD = static_json(
+    {
         "fitness_levels": [
             {
                 "id": level.value,
@@ -371,173 +597,205 @@ async def get_fitness_levels():
             for level in ExperienceLevelEnum
         ]
     }
+)
+
+
+@router.get("/fitness-levels", tags=["Tips & Advice"])
+async def get_fitness_levels(request: Request):
+    """📈 Get fitness level options (alias for experience-levels)"""
+    return static_response(request, _FITNESS_LEVELS_PAYLOAD)
+
+
+_CHALLENGES_PAYLOAD = static_json(
+    {
+        "challenges": [
+            {
+                "id": "lack_of_motivation",
+                "name": "Lack of Motivation",
+                "description": "Difficulty staying motivated to exercise",
+            },
+            {
+                "id": "time_constraints",
+                "name": "Time Constraints",
+                "description": "Not enough time for regular workouts",
+            },
+            {
+                "id": "budget_limitations",
+                "name": "Budget Limitations",
+                "description": "Limited budget for gym or equipment",
+            },
+            {
+                "id": "lack_of_knowledge",
+                "name": "Lack of Knowledge",
+                "description": "Unsure about proper exercise techniques",
+            },
+            {
+                "id": "plateau",
+                "name": "Fitness Plateau",
+                "description": "Progress has stalled or stopped",
+            },
+            {
+                "id": "lack_of_energy",
+                "name": "Lack of Energy",
+                "description": "Feeling too tired to exercise regularly",
+            },
+            {
+                "id": "injury_recovery",
+                "name": "Injury Recovery",
+                "description": "Working around or recovering from injury",
+            },
+            {
+                "id": "social_pressure",
+                "name": "Social Pressure",
+                "description": "Negative social environment or peer pressure",
+            },
+        ]
+    }
+)
 
 
 @router.get("/challenges", tags=["Tips & Advice"])
-async def get_challenges():
+async def get_challenges(request: Request):
     """🎯 Get common health and fitness challenges"""
-    challenges = [
-        {
-            "id": "lack_of_motivation",
-            "name": "Lack of Motivation",
-            "description": "Difficulty staying motivated to exercise",
-        },
-        {
-            "id": "time_constraints",
-            "name": "Time Constraints",
-            "description": "Not enough time for regular workouts",
-        },
-        {
-            "id": "budget_limitations",
-            "name": "Budget Limitations",
-            "description": "Limited budget for gym or equipment",
-        },
-        {
-            "id": "lack_of_knowledge",
-            "name": "Lack of Knowledge",
-            "description": "Unsure about proper exercise techniques",
-        },
-        {
-            "id": "plateau",
-            "name": "Fitness Plateau",
-            "description": "Progress has stalled or stopped",
-        },
-        {
-            "id": "lack_of_energy",
-            "name": "Lack of Energy",
-            "description": "Feeling too tired to exercise regularly",
-        },
-        {
-            "id": "injury_recovery",
-            "name": "Injury Recovery",
-            "description": "Working around or recovering from injury",
-        },
-        {
-            "id": "social_pressure",
-            "name": "Social Pressure",
-            "description": "Negative social environment or peer pressure",
-        },
-    ]
-    return {"challenges": challenges}
+    return static_response(request, _CHALLENGES_PAYLOAD)
+
+
+_ACTIVITIES_PAYLOAD = static_json(
+    {
+        "activities": [
+            {
+                "id": "weight_training",
+                "name": "Weight Training",
+                "description": "Resistance training with weights",
+            },
+            {
+                "id": "cardio",
+                "name": "Cardio",
+                "description": "Cardiovascular exercises like running, cycling",
+            },
+            {
+                "id": "yoga",
+                "name": "Yoga",
+                "description": "Mind-body practice combining poses and breathing",
+            },
+            {
+                "id": "walking",
+                "name": "Walking",
+                "description": "Low-impact aerobic exercise",
+            },
+            {
+                "id": "swimming",
+                "name": "Swimming",
+                "description": "Full-body water-based exercise",
+            },
+            {
+                "id": "high_intensity_interval_training",
+                "name": "HIIT",
+                "description": "High-intensity interval training",
+            },
+            {
+                "id": "pilates",
+                "name": "Pilates",
+                "description": "Core-focused exercise system",
+            },
+            {
+                "id": "dancing",
+                "name": "Dancing",
+                "description": "Rhythmic movement for fitness and fun",
+            },
+            {
+                "id": "martial_arts",
+                "name": "Martial Arts",
+                "description": "Combat sports and self-defense training",
+            },
+            {
+                "id": "outdoor_activities",
+                "name": "Outdoor Activities",
+                "description": "Hiking, rock climbing, outdoor sports",
+            },
+        ]
+    }
+)
 
 
 @router.get("/activities", tags=["Tips & Advice"])
-async def get_preferred_activities():
+async def get_preferred_activities(request: Request):
     """🏃 Get preferred activity options"""
-    activities = [
-        {
-            "id": "weight_training",
-            "name": "Weight Training",
-            "description": "Resistance training with weights",
-        },
-        {
-            "id": "cardio",
-            "name": "Cardio",
-            "description": "Cardiovascular exercises like running, cycling",
-        },
-        {
-            "id": "yoga",
-            "name": "Yoga",
-            "description": "Mind-body practice combining poses and breathing",
-        },
-        {
-            "id": "walking",
-            "name": "Walking",
-            "description": "Low-impact aerobic exercise",
-        },
-        {
-            "id": "swimming",
-            "name": "Swimming",
-            "description": "Full-body water-based exercise",
-        },
-        {
-            "id": "high_intensity_interval_training",
-            "name": "HIIT",
-            "description": "High-intensity interval training",
-        },
-        {
-            "id": "pilates",
-            "name": "Pilates",
-            "description": "Core-focused exercise system",
-        },
-        {
-            "id": "dancing",
-            "name": "Dancing",
-            "description": "Rhythmic movement for fitness and fun",
-        },
-        {
-            "id": "martial_arts",
-            "name": "Martial Arts",
-            "description": "Combat sports and self-defense training",
-        },
-        {
-            "id": "outdoor_activities",
-            "name": "Outdoor Activities",
-            "description": "Hiking, rock climbing, outdoor sports",
-        },
-    ]
-    return {"activities": activities}
+    return static_response(request, _ACTIVITIES_PAYLOAD)
+
+
+_HEALTH_CONDITIONS_PAYLOAD = static_json(
+    {
+        "health_conditions": [
+            {
+                "id": "diabetes",
+                "name": "Diabetes",
+                "description": "Blood sugar regulation disorder",
+            },
+            {
+                "id": "hypertension",
+                "name": "Hypertension",
+                "description": "High blood pressure condition",
+            },
+            {
+                "id": "back_pain",
+                "name": "Back Pain",
+                "description": "Chronic or acute back pain issues",
+            },
+            {
+                "id": "knee_problems",
+                "name": "Knee Problems",
+                "description": "Knee joint issues or injuries",
+            },
+            {
+                "id": "heart_disease",
+                "name": "Heart Disease",
+                "description": "Cardiovascular health conditions",
+            },
+            {
+                "id": "arthritis",
+                "name": "Arthritis",
+                "description": "Joint inflammation and pain",
+            },
+            {
+                "id": "asthma",
+                "name": "Asthma",
+                "description": "Respiratory condition affecting breathing",
+            },
+            {
+                "id": "osteoporosis",
+                "name": "Osteoporosis",
+                "description": "Bone density loss condition",
+            },
+            {
+                "id": "fibromyalgia",
+                "name": "Fibromyalgia",
+                "description": "Chronic pain and fatigue syndrome",
+            },
+            {
+                "id": "depression",
+                "name": "Depression",
+                "description": "Mental health condition affecting mood",
+            },
+        ]
+    }
+)
 
 
 @router.get("/health-conditions", tags=["Tips & Advice"])
-async def get_health_conditions():
+async def get_health_conditions(request: Request):
     """🏥 Get common health conditions to consider"""
-    conditions = [
-        {
-            "id": "diabetes",
-            "name": "Diabetes",
-            "description": "Blood sugar regulation disorder",
-        },
-        {
-            "id": "hypertension",
-            "name": "Hypertension",
-            "description": "High blood pressure condition",
-        },
-        {
-            "id": "back_pain",
-            "name": "Back Pain",
-            "description": "Chronic or acute back pain issues",
-        },
-        {
-            "id": "knee_problems",
-            "name": "Knee Problems",
-            "description": "Knee joint issues or injuries",
-        },
-        {
-            "id": "heart_disease",
-            "name": "Heart Disease",
-            "description": "Cardiovascular health conditions",
-        },
-        {
-            "id": "arthritis",
-            "name": "Arthritis",
-            "description": "Joint inflammation and pain",
-        },
-        {
-            "id": "asthma",
-            "name": "Asthma",
-            "description": "Respiratory condition affecting breathing",
-        },
-        {
-            "id": "osteoporosis",
-            "name": "Osteoporosis",
-            "description": "Bone density loss condition",
-        },
-        {
-            "id": "fibromyalgia",
-            "name": "Fibromyalgia",
-            "description": "Chronic pain and fatigue syndrome",
-        },
-        {
-            "id": "depression",
-            "name": "Depression",
-            "description": "Mental health condition affecting mood",
-        },
-    ]
-    return {"health_conditions": conditions}
-
-
-@router.post("/quick-tip", tags=["Tips & Advice"])
+    return static_response(request, _HEALTH_CONDITIONS_PAYLOAD)
+
+
+# Only len(DomainEnum) x len(ExperienceLevelEnum) distinct quick tips exist,
+# so each one is generated once a day and then served from memory
+_quick_tip_cache = TTLCache(
+    "quick_tip", maxsize=len(DomainEnum) * len(ExperienceLevelEnum), ttl=86400
+)
+
+
+@router.post("/quick-tip", responses={200: {"model": QuickTip}}, tags=["Tips & Advice"])
 async def get_quick_tip(
     domain: DomainEnum = Query(..., description="Domain for quick tip"),
     level: ExperienceLevelEnum = Query(
@@ -545,8 +803,12 @@ async def get_quick_tip(
     ),
 ):
     """⚡ Get a single quick tip for immediate use"""
+    cached = _quick_tip_cache.get((domain, level))
+    if cached is not None:
+        return cached
+
     try:
-        logger.info(f"Generating quick tip for domain: {domain.value}")
+        logger.info("Generating quick tip for domain: %s", domain.value)
 
         prompt = f"""
 You are a health and wellness expert. Provide ONE actionable tip for {domain.value} appropriate for {level.value} level.
@@ -560,46 +822,16 @@ Requirements:
 Return a single tip object with: title, description, action_steps (array), benefits (array), time_required.
 """
 
-        response = ask_llm(prompt, max_tokens=300)  # No schema for simple response
+        # No schema for simple response
+        response = await ask_llm(prompt, max_tokens=300)
+
+        # Never keep a tip for a day that would fail QuickTip validation
+        response = QuickTip.model_validate(response).model_dump()
+        _quick_tip_cache.set((domain, level), response)
 
         logger.info("Quick tip generated successfully")
         return response
 
     except Exception as e:
-        logger.error(f"Error generating quick tip: {str(e)}")
+        logger.error("Error generating quick tip: %s", e)
         raise HTTPException(status_code=500, detail="Unable to generate quick tip")
-
-
-def _get_domain_description(domain: str) -> str:
-    descriptions = {
-        "fitness": "Exercise, training, and physical performance optimization",
-        "nutrition": "Diet, meal planning, and nutritional strategies",
-        "mental_health": "Stress management, mindfulness, and emotional wellbeing",
-        "sleep": "Sleep quality, hygiene, and recovery optimization",
-        "hydration": "Optimal fluid intake and electrolyte balance",
-        "recovery": "Rest, regeneration, and injury prevention",
-        "motivation": "Goal setting, habit formation, and adherence strategies",
-        "lifestyle": "Daily routines, time management, and life balance",
-    }
-    return descriptions.get(domain, "Specialized health and wellness guidance")
-
-
-def _get_format_description(format_type: str) -> str:
-    descriptions = {
-        "quick_tips": "Concise, immediately actionable advice",
-        "detailed_guide": "Comprehensive explanations with full context",
-        "step_by_step": "Clear sequential instructions for implementation",
-        "science_based": "Research-backed recommendations with evidence",
-        "practical_hacks": "Efficient shortcuts and optimization techniques",
-    }
-    return descriptions.get(format_type, "Custom tip format")
-
-
-def _get_level_description(level: str) -> str:
-    descriptions = {
-        "beginner": "New to the domain, needs foundational guidance",
-        "intermediate": "Some experience, ready for structured approaches",
-        "advanced": "Significant experience, seeking optimization",
-        "expert": "Extensive knowledge, interested in cutting-edge techniques",
-    }
-    return descriptions.get(level, "Custom experience level")
@@ -1,94 +1,156 @@
-import json
+import asyncio
 import logging
 import os
-import time
-from typing import Any, Dict, Optional
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import httpx
 import openai
-from dotenv import load_dotenv
+import orjson
 from fastapi import HTTPException
 
-# Load environment variables only once if not already loaded
-if not openai.api_key:
-    load_dotenv()
-    openai.api_key = os.getenv("OPENAI_API_KEY")
-
 # Logging configuration for debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def ask_llm(
+MODEL = "gpt-4o-mini"
+# Low and fixed so answers are consistent, which also makes them cacheable
+TEMPERATURE = 0.25
+
+# Identical for every call, so it also holds the JSON output rules instead of
+# appending them to each prompt
+SYSTEM_PROMPT = (
+    "You are a professional health and wellness AI that provides accurate, evidence-based recommendations. "
+    "Always return valid JSON responses that match the required schema exactly.\n\n"
+    "CRITICAL: Return ONLY valid JSON matching the required schema exactly. "
+    "No markdown, no explanations, no code blocks - just pure JSON."
+)
+
+# One pooled HTTP client per worker so LLM calls reuse warm TLS connections.
+# HTTP/2 multiplexes concurrent completions over a few of those connections
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+# Cap on concurrent LLM calls per worker; extra requests wait their turn
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+# Retries back off exponentially with full jitter so workers that failed
+# together do not retry together
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 4.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait after the failed ``attempt`` (0-based) before retrying"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Create the semaphore on first use, inside the running event loop"""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
+def _get_async_client() -> openai.AsyncOpenAI:
+    """Shared async OpenAI client, created on first use if not opened at startup"""
+    global _async_client
+    if _async_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+        _async_client = openai.AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+            ),
+        )
+    return _async_client
+
+
+def open_async_client() -> None:
+    """Create the shared client at startup, off the path of the first request"""
+    _get_async_client()
+
+
+async def close_async_client() -> None:
+    """Close the shared client and its connection pool"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def _response_format(response_schema: Optional[Dict]) -> Dict[str, Any]:
+    """JSON mode, constrained to ``response_schema`` when one is given"""
+    if response_schema is None:
+        return {"type": "json_object"}
+    return {"type": "json_schema", "json_schema": response_schema}
+
+
+def _completion_body(
+    prompt: str, max_tokens: int, response_schema: Optional[Dict]
+) -> Dict[str, Any]:
+    """Chat completion parameters, shared by direct, streamed and batched calls"""
+    return {
+        "model": MODEL,
+        "messages": _build_messages(prompt),
+        "response_format": _response_format(response_schema),
+        "temperature": TEMPERATURE,
+        "max_tokens": max_tokens,
+    }
+
+
+def _build_messages(prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+# Error body of every provider failure
+_SERVICE_UNAVAILABLE = {
+    "error": "AI service temporarily unavailable",
+    "message": "Please try again in a few seconds",
+}
+
+
+async def ask_llm(
     prompt: str,
     max_tokens: int = 800,
     retry_count: int = 2,
     response_schema: Optional[Dict] = None,
-    force_json: bool = False,
 ) -> Dict[str, Any]:
     """
-    Professional LLM client with optional native JSON mode for guaranteed JSON output
+    Professional LLM client with native JSON mode for guaranteed JSON output
+
+    Built on the shared async OpenAI client: awaiting the completion keeps the
+    event loop free to serve other requests while the model is generating.
+    ``response_schema`` is an OpenAI ``json_schema`` spec (name + schema) the
+    output is decoded against.
     """
-    if not openai.api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    client = _get_async_client()
+    body = _completion_body(prompt, max_tokens, response_schema)
 
     for attempt in range(retry_count + 1):
         try:
-            # Enhanced prompt with JSON requirements
-            enhanced_prompt = f"""
-{prompt}
-
-CRITICAL: Return ONLY valid JSON matching the required schema exactly. 
-No markdown, no explanations, no code blocks - just pure JSON.
-"""
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a professional health and wellness AI that provides accurate, evidence-based recommendations. Always return valid JSON responses that match the required schema exactly.",
-                },
-                {"role": "user", "content": enhanced_prompt},
-            ]
-
-            if force_json:
-                # Native JSON mode - guaranteed JSON output
-                resp = openai.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    temperature=0.25,
-                    max_tokens=max_tokens,
-                    response_format={"type": "json_object"},
-                )
-                content = resp.choices[0].message.content
-                return json.loads(content)
-            else:
-                # Fallback method with regex parsing
-                resp = openai.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    response_format={"type": "json_object"},  # Native JSON mode
-                    temperature=0.3,
-                    max_tokens=max_tokens,
-                    top_p=0.9,
-                    frequency_penalty=0.1,
-                    presence_penalty=0.1,
-                )
-
-                content = resp.choices[0].message.content.strip()
-                logger.info(
-                    f"LLM response received (attempt {attempt + 1}, tokens: ~{len(content)//4})"
-                )
+            async with _get_llm_semaphore():
+                resp = await client.chat.completions.create(**body)
 
-                # Parse JSON directly - no regex needed with JSON mode
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError as e:
-                    logger.warning(
-                        f"JSON parsing failed despite JSON mode (attempt {attempt + 1}): {str(e)}"
-                    )
-                    raise e
+            logger.info(
+                "LLM response received (attempt %s, tokens: %s)",
+                attempt + 1,
+                resp.usage.total_tokens if resp.usage else "unknown",
+            )
+            return orjson.loads(resp.choices[0].message.content)
 
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON parsing failed (attempt {attempt + 1}): {str(e)}")
+        except orjson.JSONDecodeError as e:
+            logger.warning("JSON parsing failed (attempt %s): %s", attempt + 1, e)
             if attempt == retry_count:
                 raise HTTPException(
                     status_code=422,
@@ -99,20 +161,14 @@ No markdown, no explanations, no code blocks - just pure JSON.
                         "suggestion": "Please try again or contact support",
                     },
                 )
-            time.sleep(0.5)
+            await asyncio.sleep(_retry_delay(attempt))
 
         except openai.APIError as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "error": "AI service temporarily unavailable",
-                    "message": "Please try again in a few seconds",
-                },
-            )
+            logger.error("OpenAI API error: %s", e)
+            raise HTTPException(status_code=503, detail=_SERVICE_UNAVAILABLE)
 
         except Exception as e:
-            logger.error(f"Unexpected error in ask_llm: {str(e)}")
+            logger.error("Unexpected error in ask_llm: %s", e)
             if attempt == retry_count:
                 raise HTTPException(
                     status_code=500,
@@ -121,4 +177,158 @@ No markdown, no explanations, no code blocks - just pure JSON.
                         "message": "An unexpected error occurred. Please contact support if this persists.",
                     },
                 )
-            time.sleep(0.5)
+            await asyncio.sleep(_retry_delay(attempt))
+
+
+class LLMStream:
+    """
+    Text chunks of a streamed completion, holding an LLM slot until closed
+
+    The slot is released and the upstream stream closed once the chunks are
+    fully read, or when ``aclose`` is called - whichever happens first.
+    """
+
+    def __init__(self, stream: Any, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            async for chunk in self._stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._semaphore.release()
+        await self._stream.close()
+
+
+async def ask_llm_stream(
+    prompt: str, max_tokens: int = 800, response_schema: Optional[Dict] = None
+) -> LLMStream:
+    """
+    Open a streamed completion and return an iterator over its JSON text
+
+    The request is sent before returning, so provider errors still surface as
+    HTTP errors instead of breaking a response that has already started. The
+    stream counts against LLM_MAX_CONCURRENCY until it is read or closed.
+    """
+    client = _get_async_client()
+    semaphore = _get_llm_semaphore()
+    await semaphore.acquire()
+    try:
+        stream = await client.chat.completions.create(
+            **_completion_body(prompt, max_tokens, response_schema), stream=True
+        )
+    except openai.APIError as e:
+        semaphore.release()
+        logger.error("OpenAI API error: %s", e)
+        raise HTTPException(status_code=503, detail=_SERVICE_UNAVAILABLE)
+    except BaseException:
+        semaphore.release()
+        raise
+
+    return LLMStream(stream, semaphore)
+
+
+async def submit_batch(
+    prompts: List[str],
+    max_tokens: int = 800,
+    response_schema: Optional[Dict] = None,
+) -> str:
+    """
+    Submit ``prompts`` to the OpenAI Batch API and return the batch id
+
+    Batched completions are billed at half price but finish within 24 hours,
+    so this suits offline work; results are fetched with get_batch_results.
+    """
+    client = _get_async_client()
+    lines = (
+        orjson.dumps(
+            {
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _completion_body(prompt, max_tokens, response_schema),
+            }
+        )
+        for index, prompt in enumerate(prompts)
+    )
+    try:
+        batch_file = await client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+    except openai.APIError as e:
+        logger.error("OpenAI API error: %s", e)
+        raise HTTPException(status_code=503, detail=_SERVICE_UNAVAILABLE)
+
+    logger.info("Submitted batch %s with %s requests", batch.id, len(prompts))
+    return batch.id
+
+
+async def get_batch_results(batch_id: str) -> Dict[str, Any]:
+    """
+    Status of a submitted batch, with its parsed results once completed
+
+    ``results`` follows the order of the submitted prompts; an entry is None
+    when that request failed or its output was not valid JSON.
+    """
+    client = _get_async_client()
+    try:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return {"id": batch.id, "status": batch.status, "results": None}
+
+        if batch.request_counts is None:
+            logger.error("Completed batch %s has no request counts", batch_id)
+            raise HTTPException(
+                status_code=502, detail="Batch results are missing request counts"
+            )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * batch.request_counts.total
+        if batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                item = orjson.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                # Items that cannot be matched to a prompt stay None (failed)
+                try:
+                    index = int(item["custom_id"])
+                except (KeyError, TypeError, ValueError):
+                    index = -1
+                if not 0 <= index < len(results):
+                    logger.warning(
+                        "Batch %s item has an unknown custom_id: %r",
+                        batch_id,
+                        item.get("custom_id"),
+                    )
+                    continue
+                try:
+                    content = response["body"]["choices"][0]["message"]["content"]
+                    results[index] = orjson.loads(content)
+                except (KeyError, IndexError, TypeError):
+                    logger.warning("Batch %s item %s has no content", batch_id, index)
+                except orjson.JSONDecodeError as e:
+                    logger.warning("Batch %s item is not JSON: %s", batch_id, e)
+    except openai.NotFoundError:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    except openai.APIError as e:
+        logger.error("OpenAI API error: %s", e)
+        raise HTTPException(status_code=503, detail=_SERVICE_UNAVAILABLE)
+
+    return {"id": batch.id, "status": batch.status, "results": results}
@@ -1,30 +1,77 @@
+import asyncio
+
+import orjson
 import pytest
+import pytest_asyncio
 from fastapi import status
 
+# A valid workout request, for the tests about everything but its content
+_WORKOUT_REQUEST = {
+    "age": 25,
+    "gender": "M",
+    "weight": 70,
+    "height": 175,
+    "fitness_level": "beginner",
+    "primary_goal": "muscle_gain",
+    "sessions_per_week": 3,
+    "available_equipment": "bodyweight",
+}
+
+_STATIC_PATHS = ("/", "/health", "/openapi.json", "/docs", "/redoc")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def static_responses(async_client):
+    """Responses of the unauthenticated GET endpoints, fetched concurrently."""
+    responses = await asyncio.gather(*map(async_client.get, _STATIC_PATHS))
+    return dict(zip(_STATIC_PATHS, responses))
+
 
 class TestHealthCheck:
     """Test suite for health check endpoints."""
 
-    @pytest.mark.asyncio
-    async def test_root_endpoint(self, async_client):
+    def test_root_endpoint(self, static_responses):
         """Test root endpoint returns welcome message."""
-        response = await async_client.get("/")
+        response = static_responses["/"]
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert "message" in data
         assert "Universe API" in data["message"]
 
-    @pytest.mark.asyncio
-    async def test_health_endpoint(self, async_client):
+    def test_health_endpoint(self, static_responses):
         """Test health endpoint returns system status."""
-        response = await async_client.get("/health")
+        response = static_responses["/health"]
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert "status" in data
         assert data["status"] == "healthy"
 
+    @pytest.mark.asyncio
+    async def test_static_endpoint_cache_headers(self, async_client):
+        """Test static endpoints are served with HTTP caching headers."""
+        response = await async_client.get("/api/v1/metadata/fitness/goals")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["cache-control"] == "public, max-age=86400"
+        assert response.headers["etag"].startswith('"')
+
+    @pytest.mark.asyncio
+    async def test_static_endpoint_not_modified(self, async_client):
+        """Test a matching If-None-Match returns 304 without a body."""
+        response = await async_client.get("/api/v1/metadata/tips/challenges")
+        etag = response.headers["etag"]
+
+        response = await async_client.get(
+            "/api/v1/metadata/tips/challenges", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
 
 class TestAuthentication:
     """Test suite for API authentication."""
@@ -33,38 +80,18 @@ class TestAuthentication:
     async def test_protected_endpoint_without_key(self, async_client):
         """Test that protected endpoints require API key."""
         # Test fitness endpoint without API key
-        payload = {
-            "age": 25,
-            "gender": "M",
-            "weight": 70,
-            "height": 175,
-            "fitness_level": "beginner",
-            "primary_goal": "muscle_gain",
-            "sessions_per_week": 3,
-            "available_equipment": "bodyweight",
-        }
-
-        response = await async_client.post("/api/v1/fitness/workout", json=payload)
+        response = await async_client.post(
+            "/api/v1/fitness/workout", json=_WORKOUT_REQUEST
+        )
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
     async def test_protected_endpoint_with_invalid_key(self, async_client):
         """Test that protected endpoints reject invalid API keys."""
-        payload = {
-            "age": 25,
-            "gender": "M",
-            "weight": 70,
-            "height": 175,
-            "fitness_level": "beginner",
-            "primary_goal": "muscle_gain",
-            "sessions_per_week": 3,
-            "available_equipment": "bodyweight",
-        }
-
         response = await async_client.post(
             "/api/v1/fitness/workout",
-            json=payload,
+            json=_WORKOUT_REQUEST,
             headers={"X-API-Key": "invalid-key"},
         )
 
@@ -75,50 +102,63 @@ class TestAuthentication:
         self, async_client, openai_mock_fitness, valid_headers
     ):
         """Test that protected endpoints accept valid API keys."""
-        payload = {
-            "age": 25,
-            "gender": "M",
-            "weight": 70,
-            "height": 175,
-            "fitness_level": "beginner",
-            "primary_goal": "muscle_gain",
-            "sessions_per_week": 3,
-            "available_equipment": "bodyweight",
-        }
-
         response = await async_client.post(
-            "/api/v1/fitness/workout", json=payload, headers=valid_headers
+            "/api/v1/fitness/workout", json=_WORKOUT_REQUEST, headers=valid_headers
         )
 
         assert response.status_code == status.HTTP_200_OK
 
+    @pytest.mark.asyncio
+    async def test_only_valid_keys_are_cached(self):
+        """Test that successful validations are cached and failures are not."""
+        from fastapi import HTTPException
+
+        from app.main import _validation_cache, verify_api_key
+
+        _validation_cache.clear()
+
+        assert await verify_api_key("test-key") is True
+        assert "test-key" in _validation_cache
+
+        with pytest.raises(HTTPException):
+            await verify_api_key("invalid-key")
+        assert "invalid-key" not in _validation_cache
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_key_rejected(self):
+        """Test that a non-ASCII API key is rejected rather than erroring."""
+        from fastapi import HTTPException
+
+        from app.main import verify_api_key
+
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_api_key("clé-invalide")
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
 
 class TestAPIDocumentation:
     """Test suite for API documentation endpoints."""
 
-    @pytest.mark.asyncio
-    async def test_openapi_schema(self, async_client):
+    def test_openapi_schema(self, static_responses):
         """Test OpenAPI schema is accessible."""
-        response = await async_client.get("/openapi.json")
+        response = static_responses["/openapi.json"]
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "openapi" in data
         assert "info" in data
         assert "paths" in data
 
-    @pytest.mark.asyncio
-    async def test_docs_endpoint(self, async_client):
+    def test_docs_endpoint(self, static_responses):
         """Test Swagger UI documentation is accessible."""
-        response = await async_client.get("/docs")
+        response = static_responses["/docs"]
 
         assert response.status_code == status.HTTP_200_OK
         assert "text/html" in response.headers["content-type"]
 
-    @pytest.mark.asyncio
-    async def test_redoc_endpoint(self, async_client):
+    def test_redoc_endpoint(self, static_responses):
         """Test ReDoc documentation is accessible."""
-        response = await async_client.get("/redoc")
+        response = static_responses["/redoc"]
 
         assert response.status_code == status.HTTP_200_OK
         assert "text/html" in response.headers["content-type"]
@@ -155,15 +195,44 @@ class TestErrorHandling:
         data = response.json()
         assert "detail" in data
 
+    @pytest.mark.asyncio
+    async def test_startup_rejects_empty_required_env_var(self, monkeypatch):
+        """Test an empty OPENAI_API_KEY fails startup like a missing one."""
+        from app.main import app, lifespan
+
+        monkeypatch.setenv("OPENAI_API_KEY", "")
+
+        with pytest.raises(RuntimeError, match="OPENAI_API_KEY"):
+            async with lifespan(app):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_unhandled_exception_returns_500(self):
+        """Test unexpected errors are turned into a JSON 500 response."""
+        from httpx import ASGITransport, AsyncClient
+
+        from app.main import RequestMiddleware
+
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        transport = ASGITransport(app=RequestMiddleware(failing_app))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/boom")
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        data = response.json()
+        assert data["error"] == "Internal server error"
+        assert "request_id" in data
+
 
 class TestCORS:
     """Test suite for CORS configuration."""
 
-    @pytest.mark.asyncio
-    async def test_cors_headers_present(self, async_client):
+    def test_cors_headers_present(self, static_responses):
         """Test that CORS headers are present in API responses."""
         # Test with a proper API endpoint that supports CORS
-        response = await async_client.get("/health")
+        response = static_responses["/health"]
 
         # In test environment, CORS headers might not be present
         # Just verify the endpoint is accessible and returns 200
@@ -1,7 +1,48 @@
+import asyncio
+import json
+
+import orjson
 import pytest
 from fastapi import status
-
-from app.routers.nutri import NutritionResponse
+from pydantic import ValidationError
+
+from app.routers import nutri
+from app.routers.nutri import NutritionRequest, NutritionResponse
+
+# Shared by the tests that do not care about the exact profile; variants
+# are built by overriding keys instead of repeating the whole request
+_BASE_NUTRITION_REQUEST = {
+    "age": 30,
+    "gender": "M",
+    "weight": 80.0,
+    "height": 180,
+    "activity_level": "moderately_active",
+    "nutrition_goal": "muscle_gain",
+}
+
+# Keys every generated plan and each of its meals must carry
+_PLAN_KEYS = frozenset(
+    ("daily_calories", "daily_macros", "meals", "weekly_meal_prep", "shopping_list")
+)
+_MEAL_KEYS = frozenset(
+    (
+        "name",
+        "time",
+        "calories",
+        "macros",
+        "ingredients",
+        "preparation_time",
+        "instructions",
+        "tips",
+    )
+)
+
+
+@pytest.fixture(scope="session")
+def nutrition_document(nutrition_payload):
+    """The mocked plan, sent as generated, validated once per session."""
+    NutritionResponse.model_validate(nutrition_payload)
+    return nutrition_payload
 
 
 class TestNutritionGeneration:
@@ -9,16 +50,11 @@ class TestNutritionGeneration:
 
     @pytest.mark.asyncio
     async def test_nutrition_generation_success(
-        self, async_client, openai_mock_nutrition, valid_headers
+        self, async_client, openai_mock_nutrition, valid_headers, nutrition_document
     ):
         """Test successful nutrition plan generation with valid payload."""
         payload = {
-            "age": 30,
-            "gender": "M",
-            "weight": 80.0,
-            "height": 180,
-            "activity_level": "moderately_active",
-            "nutrition_goal": "muscle_gain",
+            **_BASE_NUTRITION_REQUEST,
             "dietary_restrictions": [],
             "cooking_time_available": 30,
             "meals_per_day": 3,
@@ -32,34 +68,148 @@ class TestNutritionGeneration:
         data = response.json()
 
         # Verify required keys are present
-        required_keys = [
-            "daily_calories",
-            "daily_macros",
-            "meals",
-            "weekly_meal_prep",
-            "shopping_list",
-        ]
-        for key in required_keys:
-            assert key in data, f"Missing required key: {key}"
-
-        # Verify Pydantic model validation
-        NutritionResponse(**data)
+        assert _PLAN_KEYS <= data.keys(), f"Missing keys: {_PLAN_KEYS - data.keys()}"
+
+        # The mocked plan was validated once, comparing is enough
+        assert data == nutrition_document
+
+    @pytest.mark.asyncio
+    async def test_nutrition_plan_cached(
+        self, async_client, openai_mock_nutrition, valid_headers
+    ):
+        """Test repeated plans are cached unless the client sends no-cache."""
+        payload = _BASE_NUTRITION_REQUEST
+
+        for _ in range(2):
+            response = await async_client.post(
+                "/api/v1/nutrition/plan", json=payload, headers=valid_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+        assert openai_mock_nutrition.calls.call_count == 1
+
+        response = await async_client.post(
+            "/api/v1/nutrition/plan",
+            json=payload,
+            headers={**valid_headers, "Cache-Control": "no-cache"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert openai_mock_nutrition.calls.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_nutrition_plan_invalid_not_cached(
+        self, async_client, openai_mock, nutrition_payload, valid_headers
+    ):
+        """Test a plan failing model validation is rejected and not cached."""
+        plan = {**nutrition_payload, "meals": [{"name": "Breakfast"}]}
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={"choices": [{"message": {"content": orjson.dumps(plan).decode()}}]},
+        )
+
+        for _ in range(2):
+            response = await async_client.post(
+                "/api/v1/nutrition/plan",
+                json=_BASE_NUTRITION_REQUEST,
+                headers=valid_headers,
+            )
+            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_nutrition_plan_token_budget(
+        self, async_client, openai_mock_nutrition, valid_headers
+    ):
+        """Test the output budget scales with meals and the schema is sent."""
+        payload = {**_BASE_NUTRITION_REQUEST, "meals_per_day": 5}
+
+        response = await async_client.post(
+            "/api/v1/nutrition/plan", json=payload, headers=valid_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        sent = json.loads(openai_mock_nutrition.calls.last.request.content)
+        assert sent["max_tokens"] == nutri._plan_max_tokens(5) == 1380
+        # Small plans keep the budget a complete plan needs
+        assert nutri._plan_max_tokens(2) == nutri._plan_max_tokens(3) == 1200
+        assert sent["response_format"]["json_schema"] == nutri._PLAN_SCHEMA
+
+    @pytest.mark.asyncio
+    async def test_nutrition_plan_batch(
+        self, async_client, openai_mock_nutrition, valid_headers, nutrition_document
+    ):
+        """Test batched profiles are planned together, sharing identical ones."""
+        payload = _BASE_NUTRITION_REQUEST
+
+        response = await async_client.post(
+            "/api/v1/nutrition/plan/batch",
+            json={"requests": [payload, payload, {**payload, "age": 40}]},
+            headers=valid_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        plans = response.json()["plans"]
+        assert len(plans) == 3
+        assert all(plan == nutrition_document for plan in plans)
+        assert openai_mock_nutrition.calls.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_nutrition_plan_batch_too_large(self, async_client, valid_headers):
+        """Test batches above the size limit are rejected."""
+        payload = _BASE_NUTRITION_REQUEST
+
+        response = await async_client.post(
+            "/api/v1/nutrition/plan/batch",
+            json={"requests": [payload] * (nutri.MAX_BATCH_SIZE + 1)},
+            headers=valid_headers,
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
     @pytest.mark.asyncio
-    async def test_nutrition_generation_validation_error_age(
+    async def test_nutrition_plan_timeout(
+        self, async_client, valid_headers, monkeypatch
+    ):
+        """Test a slow LLM call is cut off with a 504."""
+
+        async def slow_llm(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(nutri, "ask_llm", slow_llm)
+        monkeypatch.setattr(nutri, "PLAN_TIMEOUT", 0.01)
+        payload = _BASE_NUTRITION_REQUEST
+
+        response = await async_client.post(
+            "/api/v1/nutrition/plan", json=payload, headers=valid_headers
+        )
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "override",
+        [
+            pytest.param({"age": 150}, id="age"),
+            pytest.param({"weight": 500.0}, id="weight"),
+        ],
+    )
+    def test_nutrition_request_out_of_range(self, override):
+        """Test out-of-range body metrics are rejected by the request model."""
+        with pytest.raises(ValidationError):
+            NutritionRequest(**{**_BASE_NUTRITION_REQUEST, **override})
+
+    @pytest.mark.asyncio
+    async def test_nutrition_generation_validation_error_target_weight(
         self, async_client, valid_headers
     ):
-        """Test validation error for invalid age."""
+        """Test validation error for a target weight that contradicts the goal."""
         payload = {
-            "age": 150,  # Above maximum age
-            "gender": "F",
-            "weight": 60.0,
-            "height": 165,
-            "activity_level": "lightly_active",
+            "age": 25,
+            "gender": "M",
+            "weight": 80.0,
+            "height": 175,
+            "target_weight": 85.0,  # Higher than current weight
+            "activity_level": "very_active",
             "nutrition_goal": "weight_loss",
-            "dietary_restrictions": [],
-            "cooking_time_available": 15,
-            "meals_per_day": 3,
         }
 
         response = await async_client.post(
@@ -69,20 +219,18 @@ class TestNutritionGeneration:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
     @pytest.mark.asyncio
-    async def test_nutrition_generation_validation_error_weight(
+    async def test_nutrition_generation_validation_error_allergies(
         self, async_client, valid_headers
     ):
-        """Test validation error for invalid weight."""
+        """Test validation error for too many allergies."""
         payload = {
             "age": 25,
-            "gender": "M",
-            "weight": 500.0,  # Above maximum weight
-            "height": 175,
-            "activity_level": "very_active",
+            "gender": "F",
+            "weight": 60.0,
+            "height": 165,
+            "activity_level": "lightly_active",
             "nutrition_goal": "maintenance",
-            "dietary_restrictions": [],
-            "cooking_time_available": 60,
-            "meals_per_day": 3,
+            "allergies": [f"food {i}" for i in range(11)],  # Max is 10
         }
 
         response = await async_client.post(
@@ -93,7 +241,7 @@ class TestNutritionGeneration:
 
     @pytest.mark.asyncio
     async def test_nutrition_generation_with_restrictions(
-        self, async_client, openai_mock_nutrition, valid_headers
+        self, async_client, openai_mock_nutrition, valid_headers, nutrition_document
     ):
         """Test nutrition plan generation with dietary restrictions."""
         payload = {
@@ -115,12 +263,11 @@ class TestNutritionGeneration:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        NutritionResponse(**data)
+        assert response.json() == nutrition_document
 
     @pytest.mark.asyncio
     async def test_nutrition_generation_athlete_profile(
-        self, async_client, openai_mock_nutrition, valid_headers
+        self, async_client, openai_mock_nutrition, valid_headers, nutrition_document
     ):
         """Test nutrition plan generation for athlete profile."""
         payload = {
@@ -141,8 +288,7 @@ class TestNutritionGeneration:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        NutritionResponse(**data)
+        assert response.json() == nutrition_document
 
     @pytest.mark.asyncio
     async def test_nutrition_structure_validation(
@@ -166,14 +312,10 @@ class TestNutritionGeneration:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Verify nutrition plan structure
-        assert "daily_calories" in data
-        assert "daily_macros" in data
-        assert "meals" in data
-        assert "weekly_meal_prep" in data
-        assert "shopping_list" in data
+        assert _PLAN_KEYS <= data.keys(), f"Missing keys: {_PLAN_KEYS - data.keys()}"
 
         # Verify meals structure
         meals = data["meals"]
@@ -181,22 +323,12 @@ class TestNutritionGeneration:
         assert len(meals) > 0, "Should have at least one meal"
 
         for meal in meals:
-            required_fields = [
-                "name",
-                "time",
-                "calories",
-                "macros",
-                "ingredients",
-                "preparation_time",
-                "instructions",
-                "tips",
-            ]
-            for field in required_fields:
-                assert field in meal, f"Missing field {field} in meal"
+            missing = _MEAL_KEYS - meal.keys()
+            assert not missing, f"Missing fields {missing} in meal"
 
     @pytest.mark.asyncio
     async def test_nutrition_generation_with_health_conditions(
-        self, async_client, openai_mock_nutrition, valid_headers
+        self, async_client, openai_mock_nutrition, valid_headers, nutrition_document
     ):
         """Test nutrition plan generation considering health conditions."""
         payload = {
@@ -217,19 +349,13 @@ class TestNutritionGeneration:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        NutritionResponse(**data)
+        assert response.json() == nutrition_document
 
     @pytest.mark.asyncio
     async def test_nutrition_generation_missing_api_key(self, async_client):
         """Test nutrition plan generation with missing API key."""
         payload = {
-            "age": 30,
-            "gender": "M",
-            "weight": 80.0,
-            "height": 180,
-            "activity_level": "moderately_active",
-            "nutrition_goal": "muscle_gain",
+            **_BASE_NUTRITION_REQUEST,
             "dietary_restrictions": [],
             "cooking_time_available": 30,
             "meals_per_day": 3,
@@ -243,12 +369,7 @@ class TestNutritionGeneration:
     async def test_nutrition_generation_invalid_api_key(self, async_client):
         """Test nutrition plan generation with invalid API key."""
         payload = {
-            "age": 30,
-            "gender": "M",
-            "weight": 80.0,
-            "height": 180,
-            "activity_level": "moderately_active",
-            "nutrition_goal": "muscle_gain",
+            **_BASE_NUTRITION_REQUEST,
             "dietary_restrictions": [],
             "cooking_time_available": 30,
             "meals_per_day": 3,
@@ -272,11 +393,12 @@ class TestNutritionMetadata:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        assert "dietary_preferences" in response.json()
-        assert len(response.json()["dietary_preferences"]) > 0
+        data = response.json()
+        assert "dietary_preferences" in data
+        assert len(data["dietary_preferences"]) > 0
 
         # Validate structure of first dietary preference
-        first_pref = response.json()["dietary_preferences"][0]
+        first_pref = data["dietary_preferences"][0]
         assert "id" in first_pref
         assert "name" in first_pref
         assert "description" in first_pref
@@ -287,11 +409,12 @@ class TestNutritionMetadata:
         response = await async_client.get("/api/v1/metadata/nutrition/activity-levels")
 
         assert response.status_code == status.HTTP_200_OK
-        assert "activity_levels" in response.json()
-        assert len(response.json()["activity_levels"]) > 0
+        data = response.json()
+        assert "activity_levels" in data
+        assert len(data["activity_levels"]) > 0
 
         # Validate structure of first activity level
-        first_level = response.json()["activity_levels"][0]
+        first_level = data["activity_levels"][0]
         assert "id" in first_level
         assert "name" in first_level
         assert "description" in first_level
@@ -302,11 +425,12 @@ class TestNutritionMetadata:
         response = await async_client.get("/api/v1/metadata/nutrition/goals")
 
         assert response.status_code == status.HTTP_200_OK
-        assert "goals" in response.json()
-        assert len(response.json()["goals"]) > 0
+        data = response.json()
+        assert "goals" in data
+        assert len(data["goals"]) > 0
 
         # Validate structure of first goal
-        first_goal = response.json()["goals"][0]
+        first_goal = data["goals"][0]
         assert "id" in first_goal
         assert "name" in first_goal
         assert "description" in first_goal
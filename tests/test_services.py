@@ -1,9 +1,12 @@
-import json
+import asyncio
+import time
 
+import orjson
 import pytest
-import respx
 
-from app.services.ia_client import ask_llm
+from app.services import ia_client
+from app.services.cache import TTLCache, make_key
+from app.services.ia_client import _retry_delay, ask_llm, ask_llm_stream
 
 
 class TestIAClient:
@@ -15,150 +18,221 @@ class TestIAClient:
         return ask_llm
 
     @pytest.mark.asyncio
-    async def test_ask_llm_success(self, ia_client):
+    async def test_ask_llm_success(self, ia_client, openai_mock):
         """Test successful LLM request with valid response."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            mock.post("/v1/chat/completions").respond(
-                status_code=200,
-                json={
-                    "choices": [
-                        {
-                            "message": {
-                                "content": json.dumps(
-                                    {"status": "success", "data": {"test": "value"}}
-                                )
-                            }
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={
+                "choices": [
+                    {
+                        "message": {
+                            "content": orjson.dumps(
+                                {"status": "success", "data": {"test": "value"}}
+                            ).decode()
                         }
-                    ]
-                },
-            )
+                    }
+                ]
+            },
+        )
 
-            result = ia_client("Test prompt", max_tokens=100)
-            assert result["status"] == "success"
-            assert result["data"]["test"] == "value"
+        result = await ia_client("Test prompt", max_tokens=100)
+        assert result["status"] == "success"
+        assert result["data"]["test"] == "value"
 
     @pytest.mark.asyncio
-    async def test_ask_llm_json_extraction(self, ia_client):
+    async def test_ask_llm_json_extraction(self, ia_client, openai_mock):
         """Test JSON extraction from LLM response."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            mock.post("/v1/chat/completions").respond(
-                status_code=200,
-                json={
-                    "choices": [
-                        {
-                            "message": {
-                                "content": json.dumps(
-                                    {
-                                        "workout": {
-                                            "exercises": ["push-ups", "squats"],
-                                            "duration": "30 minutes",
-                                        },
-                                        "nutrition": {"calories": 2000, "protein": 150},
-                                    }
-                                )
-                            }
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={
+                "choices": [
+                    {
+                        "message": {
+                            "content": orjson.dumps(
+                                {
+                                    "workout": {
+                                        "exercises": ["push-ups", "squats"],
+                                        "duration": "30 minutes",
+                                    },
+                                    "nutrition": {"calories": 2000, "protein": 150},
+                                }
+                            ).decode()
                         }
-                    ]
-                },
-            )
+                    }
+                ]
+            },
+        )
 
-            result = ia_client("Generate workout", max_tokens=500)
-            assert "workout" in result
-            assert "nutrition" in result
-            assert result["workout"]["exercises"] == ["push-ups", "squats"]
+        result = await ia_client("Generate workout", max_tokens=500)
+        assert "workout" in result
+        assert "nutrition" in result
+        assert result["workout"]["exercises"] == ["push-ups", "squats"]
 
     @pytest.mark.asyncio
-    async def test_ask_llm_nested_json_extraction(self, ia_client):
+    async def test_ask_llm_nested_json_extraction(self, ia_client, openai_mock):
         """Test extraction of nested JSON structures."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            mock.post("/v1/chat/completions").respond(
-                status_code=200,
-                json={
-                    "choices": [
-                        {
-                            "message": {
-                                "content": json.dumps(
-                                    {
-                                        "meals": [
-                                            {
-                                                "name": "Breakfast",
-                                                "macros": {
-                                                    "protein_g": 25,
-                                                    "carbs_g": 40,
-                                                    "fat_g": 15,
-                                                },
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={
+                "choices": [
+                    {
+                        "message": {
+                            "content": orjson.dumps(
+                                {
+                                    "meals": [
+                                        {
+                                            "name": "Breakfast",
+                                            "macros": {
+                                                "protein_g": 25,
+                                                "carbs_g": 40,
+                                                "fat_g": 15,
                                             },
-                                            {
-                                                "name": "Lunch",
-                                                "macros": {
-                                                    "protein_g": 35,
-                                                    "carbs_g": 50,
-                                                    "fat_g": 20,
-                                                },
+                                        },
+                                        {
+                                            "name": "Lunch",
+                                            "macros": {
+                                                "protein_g": 35,
+                                                "carbs_g": 50,
+                                                "fat_g": 20,
                                             },
-                                        ]
-                                    }
-                                )
-                            }
+                                        },
+                                    ]
+                                }
+                            ).decode()
                         }
-                    ]
-                },
-            )
+                    }
+                ]
+            },
+        )
 
-            result = ia_client("Generate meal plan", max_tokens=800)
-            assert "meals" in result
-            assert len(result["meals"]) == 2
-            assert result["meals"][0]["macros"]["protein_g"] == 25
+        result = await ia_client("Generate meal plan", max_tokens=800)
+        assert "meals" in result
+        assert len(result["meals"]) == 2
+        assert result["meals"][0]["macros"]["protein_g"] == 25
 
     @pytest.mark.asyncio
-    async def test_ask_llm_invalid_json_fallback(self, ia_client):
+    async def test_ask_llm_invalid_json_fallback(self, ia_client, openai_mock):
         """Test fallback behavior when JSON parsing fails."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            # First attempt returns invalid JSON
-            mock.post("/v1/chat/completions").respond(
-                status_code=200,
-                json={"choices": [{"message": {"content": "Invalid JSON response"}}]},
-            )
+        # First attempt returns invalid JSON
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={"choices": [{"message": {"content": "Invalid JSON response"}}]},
+        )
 
-            with pytest.raises(Exception):  # Should raise HTTPException
-                ia_client("Test prompt", max_tokens=100, retry_count=0)
+        with pytest.raises(Exception):  # Should raise HTTPException
+            await ia_client("Test prompt", max_tokens=100, retry_count=0)
 
     @pytest.mark.asyncio
-    async def test_ask_llm_without_force_json(self, ia_client):
-        """Test LLM request without force_json parameter."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            mock.post("/v1/chat/completions").respond(
-                status_code=200,
-                json={
-                    "choices": [
-                        {
-                            "message": {
-                                "content": json.dumps(
-                                    {
-                                        "tips": ["Tip 1", "Tip 2", "Tip 3"],
-                                        "category": "fitness",
-                                    }
-                                )
-                            }
+    async def test_ask_llm_sampling_params(self, ia_client, openai_mock):
+        """Test every completion is sent with the same sampling parameters."""
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={
+                "choices": [
+                    {
+                        "message": {
+                            "content": orjson.dumps(
+                                {
+                                    "tips": ["Tip 1", "Tip 2", "Tip 3"],
+                                    "category": "fitness",
+                                }
+                            ).decode()
                         }
-                    ]
-                },
-            )
+                    }
+                ]
+            },
+        )
+
+        result = await ia_client("Generate tips", max_tokens=300)
+        assert "tips" in result
+        assert len(result["tips"]) == 3
 
-            result = ia_client("Generate tips", max_tokens=300, force_json=False)
-            assert "tips" in result
-            assert len(result["tips"]) == 3
+        sent = orjson.loads(route.calls.last.request.content)
+        assert sent["temperature"] == 0.25
+        assert "top_p" not in sent
+        assert "frequency_penalty" not in sent
 
     @pytest.mark.asyncio
-    async def test_ask_llm_openai_error(self, ia_client):
+    async def test_ask_llm_openai_error(self, ia_client, openai_mock):
         """Test handling of OpenAI API errors."""
-        with respx.mock(base_url="https://api.openai.com") as mock:
-            mock.post("/v1/chat/completions").respond(
-                status_code=500, json={"error": "Internal server error"}
-            )
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=500, json={"error": "Internal server error"}
+        )
+
+        with pytest.raises(Exception):  # Should raise HTTPException
+            await ia_client("Test prompt", max_tokens=100)
+
+    @pytest.mark.asyncio
+    async def test_ask_llm_response_schema(self, openai_mock):
+        """Test a response schema is sent as a json_schema response format."""
+        schema = {"name": "status", "schema": {"type": "object"}}
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={"choices": [{"message": {"content": '{"status": "ok"}'}}]},
+        )
+
+        result = await ask_llm("Test prompt", max_tokens=100, response_schema=schema)
+
+        sent = orjson.loads(route.calls.last.request.content)
+        assert result == {"status": "ok"}
+        assert sent["response_format"] == {"type": "json_schema", "json_schema": schema}
+        # The JSON instructions live in the constant system message
+        assert sent["messages"][1] == {"role": "user", "content": "Test prompt"}
+
+    @pytest.mark.asyncio
+    async def test_ask_llm_stream_holds_slot_until_read(self, openai_mock, monkeypatch):
+        """Test a streamed completion counts against the cap until fully read."""
+        monkeypatch.setattr(ia_client, "_llm_semaphore", asyncio.Semaphore(1))
+        events = "".join(
+            "data: "
+            + orjson.dumps(
+                {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "gpt-4o-mini",
+                    "choices": [
+                        {"index": 0, "delta": {"content": part}, "finish_reason": None}
+                    ],
+                }
+            ).decode()
+            + "\n\n"
+            for part in ('{"status"', ': "ok"}')
+        )
+        openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            headers={"Content-Type": "text/event-stream"},
+            content=events + "data: [DONE]\n\n",
+        )
+
+        stream = await ask_llm_stream("Test prompt", max_tokens=100)
+        assert ia_client._llm_semaphore.locked()
+
+        text = "".join([chunk async for chunk in stream])
+        assert text == '{"status": "ok"}'
+        assert not ia_client._llm_semaphore.locked()
+
+        # Closing a stream that was never read frees its slot as well
+        stream = await ask_llm_stream("Test prompt", max_tokens=100)
+        assert ia_client._llm_semaphore.locked()
+        await stream.aclose()
+        await stream.aclose()
+        assert not ia_client._llm_semaphore.locked()
 
-            with pytest.raises(Exception):  # Should raise HTTPException
-                ia_client("Test prompt", max_tokens=100)
+    def test_retry_delay_backs_off_with_jitter(self, monkeypatch):
+        """Test retry delays double per attempt up to a cap, with jitter."""
+        monkeypatch.setattr("random.uniform", lambda low, high: high)
+        assert [_retry_delay(attempt) for attempt in range(6)] == [
+            0.25,
+            0.5,
+            1.0,
+            2.0,
+            4.0,
+            4.0,
+        ]
+
+        monkeypatch.setattr("random.uniform", lambda low, high: low)
+        assert _retry_delay(3) == 0
 
     def test_extract_json_simple(self, ia_client):
         """Test simple JSON extraction."""
@@ -183,6 +257,48 @@ class TestIAClient:
         pass
 
 
+class TestResponseCache:
+    """Test suite for the in-process response cache."""
+
+    def test_cache_hit_and_miss(self):
+        """Test values are returned until they are evicted."""
+        cache = TTLCache("test-hit-miss", maxsize=2, ttl=60)
+
+        assert cache.get("a") is None
+        cache.set("a", {"value": 1})
+        assert cache.get("a") == {"value": 1}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache("test-lru", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_cache_entries_expire(self, monkeypatch):
+        """Test entries older than the TTL are dropped."""
+        cache = TTLCache("test-ttl", maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_make_key_is_stable(self):
+        """Test keys are deterministic and sensitive to part boundaries."""
+        assert make_key("a", "bc") == make_key("a", "bc")
+        assert make_key("a", "bc") != make_key("ab", "c")
+
+
 class TestAPIKeyValidation:
     """Test suite for API key validation."""
 
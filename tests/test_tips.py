@@ -1,37 +1,234 @@
+import asyncio
+import json
+
+import orjson
 import pytest
+import pytest_asyncio
 from fastapi import status
 
 from app.routers.tips import TipsResponse
 
+# Shared by the tests that do not care about the exact request; variants
+# are built by overriding keys instead of repeating the whole request
+_BASE_TIPS_REQUEST = {
+    "domain": "fitness",
+    "experience_level": "intermediate",
+    "format_preference": "quick_tips",
+}
+
+# Keys every generated response and each of its tips must carry
+_TIPS_KEYS = frozenset(("tips", "implementation_strategy", "priority_order"))
+_TIP_KEYS = frozenset(
+    (
+        "title",
+        "category",
+        "difficulty",
+        "time_required",
+        "description",
+        "action_steps",
+        "benefits",
+    )
+)
+
+_TIPS_REQUESTS = [
+    pytest.param(_BASE_TIPS_REQUEST, id="fitness-quick-tips"),
+    pytest.param(
+        {
+            "domain": "nutrition",
+            "experience_level": "beginner",
+            "format_preference": "step_by_step",
+            "current_challenges": [
+                "lack_of_motivation",
+                "time_constraints",
+                "budget_limitations",
+                "lack_of_knowledge",
+            ],
+            "specific_goals": ["weight_loss", "energy_improvement"],
+            "time_constraints": 20,
+        },
+        id="nutrition-challenges",
+    ),
+    pytest.param(
+        {
+            "domain": "fitness",
+            "secondary_domains": ["nutrition"],
+            "experience_level": "expert",
+            "format_preference": "science_based",
+            "time_constraints": 90,
+            "current_challenges": ["plateau"],
+            "specific_goals": ["athletic_performance"],
+            "preferred_complexity": "complex",
+        },
+        id="expert-science-based",
+    ),
+    pytest.param(
+        {
+            "domain": "mental_health",
+            "experience_level": "intermediate",
+            "format_preference": "practical_hacks",
+        },
+        id="mental-health-hacks",
+    ),
+    pytest.param(
+        {
+            "domain": "recovery",
+            "experience_level": "beginner",
+            "format_preference": "detailed_guide",
+            "time_constraints": 30,
+            "lifestyle_factors": ["busy_schedule", "travel", "stress"],
+            "current_challenges": ["lack_of_energy"],
+            "age_range": "adult",
+        },
+        id="recovery-lifestyle",
+    ),
+]
+
 
 class TestTipsGeneration:
     """Test suite for tips generation."""
 
     @pytest.mark.asyncio
-    async def test_tips_generation_success(
-        self, async_client, openai_mock_tips, valid_headers
+    @pytest.mark.parametrize("payload", _TIPS_REQUESTS)
+    async def test_tips_generation(
+        self, async_client, openai_mock_tips, valid_headers, payload
     ):
-        """Test successful tips generation with valid payload."""
-        payload = {
-            "domain": "fitness",
-            "experience_level": "intermediate",
-            "format_preference": "quick_tips",
-        }
-
+        """Test successful tips generation for a range of requests."""
         response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+            "/api/v1/tips/generate",
+            content=orjson.dumps(payload),
+            headers=valid_headers,
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Verify required keys are present
-        required_keys = ["tips", "implementation_strategy", "priority_order"]
-        for key in required_keys:
-            assert key in data, f"Missing required key: {key}"
+        assert _TIPS_KEYS <= data.keys(), f"Missing keys: {_TIPS_KEYS - data.keys()}"
+
+        # Verify tips structure
+        assert len(data["tips"]) >= 3, "Should have at least 3 tips"
+        assert len(data["tips"]) <= 5, "Should have at most 5 tips"
+
+        # Verify each tip has required fields
+        for tip in data["tips"]:
+            missing = _TIP_KEYS - tip.keys()
+            assert not missing, f"Missing fields {missing} in tip"
+            assert isinstance(tip["action_steps"], list)
+            assert isinstance(tip["benefits"], list)
 
         # Verify Pydantic model validation
-        TipsResponse(**data)
+        TipsResponse.model_validate(data)
+
+    @pytest.mark.asyncio
+    async def test_tips_generation_cached(
+        self, async_client, openai_mock_tips, valid_headers
+    ):
+        """Test identical tips requests are answered from the response cache."""
+        payload = _BASE_TIPS_REQUEST
+
+        responses = [
+            await async_client.post(
+                "/api/v1/tips/generate",
+                content=orjson.dumps(payload),
+                headers=valid_headers,
+            )
+            for _ in range(2)
+        ]
+
+        assert openai_mock_tips.calls.call_count == 1
+        assert responses[0].content == responses[1].content
+        assert responses[1].headers["cache-control"] == "private, max-age=600"
+        assert responses[1].headers["x-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_tips_cache_ignores_list_order_and_case(
+        self, async_client, openai_mock_tips, valid_headers
+    ):
+        """Test near-identical challenge lists share one cached response."""
+        payload = {
+            **_BASE_TIPS_REQUEST,
+            "current_challenges": ["Lack of time", "low motivation"],
+        }
+        variant = {
+            **payload,
+            "current_challenges": ["Low  Motivation", "lack of time"],
+        }
+
+        for body in (payload, variant):
+            response = await async_client.post(
+                "/api/v1/tips/generate",
+                content=orjson.dumps(body),
+                headers=valid_headers,
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        assert openai_mock_tips.calls.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_tips_token_budget(
+        self, async_client, openai_mock_tips, valid_headers
+    ):
+        """Test max_tokens follows the requested format and complexity."""
+        payload = {
+            **_BASE_TIPS_REQUEST,
+            "preferred_complexity": "simple",
+        }
+
+        for complexity, expected in (("simple", 1200), ("complex", 2000)):
+            payload["preferred_complexity"] = complexity
+            await async_client.post(
+                "/api/v1/tips/generate",
+                content=orjson.dumps(payload),
+                headers=valid_headers,
+            )
+            sent = orjson.loads(openai_mock_tips.calls.last.request.content)
+            assert sent["max_tokens"] == expected
+
+    @pytest.mark.asyncio
+    async def test_tips_stream(
+        self, async_client, openai_mock, tips_payload, valid_headers
+    ):
+        """Test streamed tips are forwarded as generated and then cached."""
+        text = json.dumps(tips_payload)
+        events = "".join(
+            "data: "
+            + json.dumps(
+                {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "gpt-4o-mini",
+                    "choices": [
+                        {"index": 0, "delta": {"content": part}, "finish_reason": None}
+                    ],
+                }
+            )
+            + "\n\n"
+            for part in (text[:10], text[10:])
+        )
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            content=events + "data: [DONE]\n\n",
+            headers={"content-type": "text/event-stream"},
+        )
+        payload = _BASE_TIPS_REQUEST
+
+        first = await async_client.post(
+            "/api/v1/tips/generate/stream",
+            content=orjson.dumps(payload),
+            headers=valid_headers,
+        )
+        second = await async_client.post(
+            "/api/v1/tips/generate",
+            content=orjson.dumps(payload),
+            headers=valid_headers,
+        )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.text == text
+        expected = TipsResponse.model_validate(tips_payload)
+        assert orjson.loads(second.content) == expected.model_dump(mode="json")
+        assert route.call_count == 1
 
     @pytest.mark.asyncio
     async def test_tips_generation_validation_error_age(
@@ -45,7 +242,9 @@ class TestTipsGeneration:
         }
 
         response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+            "/api/v1/tips/generate",
+            content=orjson.dumps(payload),
+            headers=valid_headers,
         )
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -63,212 +262,251 @@ class TestTipsGeneration:
         }
 
         response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+            "/api/v1/tips/generate",
+            content=orjson.dumps(payload),
+            headers=valid_headers,
         )
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
     @pytest.mark.asyncio
-    async def test_tips_generation_with_challenges(
-        self, async_client, openai_mock_tips, valid_headers
-    ):
-        """Test tips generation with specific challenges."""
-        payload = {
-            "domain": "nutrition",
-            "experience_level": "beginner",
-            "format_preference": "step_by_step",
-            "current_challenges": [
-                "lack_of_motivation",
-                "time_constraints",
-                "budget_limitations",
-                "lack_of_knowledge",
-            ],
-            "specific_goals": ["weight_loss", "energy_improvement"],
-            "time_constraints": 20,
-        }
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            pytest.param(None, id="missing-key"),
+            pytest.param({"X-API-Key": "invalid-key"}, id="invalid-key"),
+        ],
+    )
+    async def test_tips_generation_unauthorized(self, async_client, headers):
+        """Test tips generation without a valid API key is rejected."""
+        payload = _BASE_TIPS_REQUEST
 
         response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+            "/api/v1/tips/generate", json=payload, headers=headers
         )
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        TipsResponse(**data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
-    async def test_tips_generation_advanced_user(
-        self, async_client, openai_mock_tips, valid_headers
-    ):
-        """Test tips generation for advanced user with specific preferences."""
-        payload = {
-            "domain": "fitness",
-            "secondary_domains": ["nutrition"],
-            "experience_level": "expert",
-            "format_preference": "science_based",
-            "time_constraints": 90,
-            "current_challenges": ["plateau"],
-            "specific_goals": ["athletic_performance"],
-            "preferred_complexity": "complex",
-        }
+    async def test_tips_batch_submit(self, async_client, openai_mock, valid_headers):
+        """Test batched tips requests are uploaded as one Batch API job."""
+        payload = _BASE_TIPS_REQUEST
+        upload = openai_mock.post("/v1/files").respond(
+            status_code=200,
+            json={
+                "id": "file-1",
+                "object": "file",
+                "bytes": 1,
+                "created_at": 0,
+                "filename": "batch.jsonl",
+                "purpose": "batch",
+                "status": "processed",
+            },
+        )
+        openai_mock.post("/v1/batches").respond(
+            status_code=200, json=_batch("validating")
+        )
 
         response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+            "/api/v1/tips/generate-batch",
+            content=orjson.dumps(
+                {"requests": [payload, {**payload, "domain": "sleep"}]}
+            ),
+            headers=valid_headers,
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        TipsResponse(**data)
+        assert orjson.loads(response.content) == {
+            "batch_id": "batch-1",
+            "status": "submitted",
+        }
+        assert upload.calls.last.request.content.count(b'"custom_id"') == 2
 
     @pytest.mark.asyncio
-    async def test_tips_structure_validation(
-        self, async_client, openai_mock_tips, valid_headers
-    ):
-        """Test that tips have the correct structure and content."""
-        payload = {
-            "domain": "mental_health",
-            "experience_level": "intermediate",
-            "format_preference": "practical_hacks",
-        }
+    async def test_tips_batch_results(self, async_client, openai_mock, valid_headers):
+        """Test completed batch results are returned in request order."""
+        tips = {"tips": [], "implementation_strategy": {}, "priority_order": []}
+        lines = [
+            {
+                "custom_id": "1",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": json.dumps(tips)}}]},
+                },
+            },
+            {"custom_id": "0", "response": None, "error": {"code": "failed"}},
+            # Successful but without any content, so the slot stays failed
+            {"custom_id": "0", "response": {"status_code": 200}},
+            {
+                "custom_id": "0",
+                "response": {"status_code": 200, "body": {"choices": []}},
+            },
+            {
+                "custom_id": "0",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": None}}]},
+                },
+            },
+            # Not tied to any submitted prompt, so it is skipped
+            {
+                "custom_id": "request-7",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": json.dumps(tips)}}]},
+                },
+            },
+        ]
+        openai_mock.get("/v1/batches/batch-1").respond(
+            status_code=200, json=_batch("completed", output_file_id="file-2")
+        )
+        openai_mock.get("/v1/files/file-2/content").respond(
+            status_code=200,
+            content="\n".join(json.dumps(line) for line in lines).encode(),
+        )
 
-        response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+        response = await async_client.get(
+            "/api/v1/tips/batch/batch-1", headers=valid_headers
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        # Verify tips structure
-        assert "tips" in data
-        assert len(data["tips"]) >= 3, "Should have at least 3 tips"
-        assert len(data["tips"]) <= 5, "Should have at most 5 tips"
-
-        # Verify each tip has required fields
-        for tip in data["tips"]:
-            required_fields = [
-                "title",
-                "category",
-                "difficulty",
-                "time_required",
-                "description",
-                "action_steps",
-                "benefits",
-            ]
-            for field in required_fields:
-                assert field in tip, f"Missing field {field} in tip"
-            assert isinstance(tip["action_steps"], list)
-            assert isinstance(tip["benefits"], list)
+        data = orjson.loads(response.content)
+        assert data["status"] == "completed"
+        assert data["tips"] == [{"error": "Tips generation failed"}, tips]
 
     @pytest.mark.asyncio
-    async def test_tips_generation_with_health_conditions(
-        self, async_client, openai_mock_tips, valid_headers
+    async def test_tips_batch_results_without_request_counts(
+        self, async_client, openai_mock, valid_headers
     ):
-        """Test tips generation considering lifestyle factors."""
-        payload = {
-            "domain": "recovery",
-            "experience_level": "beginner",
-            "format_preference": "detailed_guide",
-            "time_constraints": 30,
-            "lifestyle_factors": ["busy_schedule", "travel", "stress"],
-            "current_challenges": ["lack_of_energy"],
-            "age_range": "adult",
-        }
+        """Test a completed batch without request counts is a clear error."""
+        openai_mock.get("/v1/batches/batch-1").respond(
+            status_code=200,
+            json={
+                **_batch("completed", output_file_id="file-2"),
+                "request_counts": None,
+            },
+        )
 
-        response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers=valid_headers
+        response = await async_client.get(
+            "/api/v1/tips/batch/batch-1", headers=valid_headers
         )
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        TipsResponse(**data)
+        assert response.status_code == status.HTTP_502_BAD_GATEWAY
 
     @pytest.mark.asyncio
-    async def test_tips_generation_missing_api_key(self, async_client):
-        """Test tips generation with missing API key."""
-        payload = {
-            "domain": "fitness",
-            "experience_level": "intermediate",
-            "format_preference": "quick_tips",
+    async def test_quick_tip_cached_per_domain_and_level(
+        self, async_client, openai_mock, valid_headers
+    ):
+        """Test each (domain, level) quick tip is generated only once."""
+        tip = {
+            "title": "Hydrate",
+            "description": "Drink a glass of water",
+            "action_steps": ["Fill a glass", "Drink it"],
+            "benefits": ["Better focus"],
+            "time_required": "1 minute",
         }
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={"choices": [{"message": {"content": json.dumps(tip)}}]},
+        )
 
-        response = await async_client.post("/api/v1/tips/generate", json=payload)
+        for params in (
+            {"domain": "hydration"},
+            {"domain": "hydration", "level": "beginner"},
+            {"domain": "hydration", "level": "expert"},
+        ):
+            response = await async_client.post(
+                "/api/v1/tips/quick-tip", params=params, headers=valid_headers
+            )
+            assert orjson.loads(response.content) == tip
 
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert route.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_tips_generation_invalid_api_key(self, async_client):
-        """Test tips generation with invalid API key."""
-        payload = {
-            "domain": "fitness",
-            "experience_level": "intermediate",
-            "format_preference": "quick_tips",
-        }
-
-        response = await async_client.post(
-            "/api/v1/tips/generate", json=payload, headers={"X-API-Key": "invalid-key"}
+    async def test_quick_tip_invalid_not_cached(
+        self, async_client, openai_mock, valid_headers
+    ):
+        """Test a quick tip failing validation is rejected and not cached."""
+        tip = {"title": "Hydrate", "description": "Drink a glass of water"}
+        route = openai_mock.post("/v1/chat/completions").respond(
+            status_code=200,
+            json={"choices": [{"message": {"content": json.dumps(tip)}}]},
         )
 
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        for _ in range(2):
+            response = await async_client.post(
+                "/api/v1/tips/quick-tip",
+                params={"domain": "hydration"},
+                headers=valid_headers,
+            )
+            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert route.call_count == 2
+
+
+def _batch(batch_status, output_file_id=None):
+    """Batch object as returned by the OpenAI API."""
+    return {
+        "id": "batch-1",
+        "object": "batch",
+        "endpoint": "/v1/chat/completions",
+        "input_file_id": "file-1",
+        "completion_window": "24h",
+        "status": batch_status,
+        "created_at": 0,
+        "output_file_id": output_file_id,
+        "request_counts": {"total": 2, "completed": 1, "failed": 1},
+    }
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def tips_metadata(async_client):
+    """Static tips metadata documents, fetched concurrently once per session."""
+    names = ("fitness-levels", "challenges", "activities", "health-conditions")
+    responses = await asyncio.gather(
+        *(async_client.get(f"/api/v1/metadata/tips/{name}") for name in names)
+    )
+    return dict(zip(names, responses))
 
 
 class TestTipsMetadata:
     """Test suite for tips metadata endpoints."""
 
-    @pytest.mark.asyncio
-    async def test_get_fitness_levels(self, async_client):
-        """Test getting fitness levels"""
-        response = await async_client.get("/api/v1/metadata/tips/fitness-levels")
-
-        assert response.status_code == status.HTTP_200_OK
-        assert "fitness_levels" in response.json()
-        assert len(response.json()["fitness_levels"]) > 0
-
-        # Validate structure of first fitness level
-        first_level = response.json()["fitness_levels"][0]
-        assert "id" in first_level
-        assert "name" in first_level
-        assert "description" in first_level
-
-    @pytest.mark.asyncio
-    async def test_get_challenges(self, async_client):
-        """Test getting challenges"""
-        response = await async_client.get("/api/v1/metadata/tips/challenges")
+    @pytest.mark.parametrize(
+        "name, key",
+        [
+            ("fitness-levels", "fitness_levels"),
+            ("challenges", "challenges"),
+            ("activities", "activities"),
+            ("health-conditions", "health_conditions"),
+        ],
+    )
+    def test_get_metadata(self, tips_metadata, name, key):
+        """Test each metadata list is served with id, name and description"""
+        response = tips_metadata[name]
 
         assert response.status_code == status.HTTP_200_OK
-        assert "challenges" in response.json()
-        assert len(response.json()["challenges"]) > 0
+        data = orjson.loads(response.content)
+        assert key in data
+        assert len(data[key]) > 0
 
-        # Validate structure of first challenge
-        first_challenge = response.json()["challenges"][0]
-        assert "id" in first_challenge
-        assert "name" in first_challenge
-        assert "description" in first_challenge
+        # Validate structure of the first entry
+        first = data[key][0]
+        assert "id" in first
+        assert "name" in first
+        assert "description" in first
 
     @pytest.mark.asyncio
-    async def test_get_preferred_activities(self, async_client):
-        """Test getting preferred activities"""
-        response = await async_client.get("/api/v1/metadata/tips/activities")
+    async def test_get_domains(self, async_client, valid_headers):
+        """Test getting tip domains with conditional GET support"""
+        response = await async_client.get("/api/v1/tips/domains", headers=valid_headers)
 
         assert response.status_code == status.HTTP_200_OK
-        assert "activities" in response.json()
-        assert len(response.json()["activities"]) > 0
+        domains = orjson.loads(response.content)["domains"]
+        assert {domain["id"] for domain in domains} >= {"fitness", "sleep"}
+        assert all(domain["description"] for domain in domains)
 
-        # Validate structure of first activity
-        first_activity = response.json()["activities"][0]
-        assert "id" in first_activity
-        assert "name" in first_activity
-        assert "description" in first_activity
-
-    @pytest.mark.asyncio
-    async def test_get_health_conditions(self, async_client):
-        """Test getting health conditions"""
-        response = await async_client.get("/api/v1/metadata/tips/health-conditions")
-
-        assert response.status_code == status.HTTP_200_OK
-        assert "health_conditions" in response.json()
-        assert len(response.json()["health_conditions"]) > 0
-
-        # Validate structure of first health condition
-        first_condition = response.json()["health_conditions"][0]
-        assert "id" in first_condition
-        assert "name" in first_condition
-        assert "description" in first_condition
+        cached = await async_client.get(
+            "/api/v1/tips/domains",
+            headers={**valid_headers, "If-None-Match": response.headers["etag"]},
+        )
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED